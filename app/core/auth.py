@@ -1,63 +1,159 @@
+import asyncio
+import base64
+import bcrypt
+import calendar
+import hashlib
+import hmac
+import os
+import secrets
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from time import monotonic
 from typing import Optional
+import orjson
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from app.models.user import TokenData, User, UserInDB
 from app.db.database import mongodb
 from .config import settings
+from .token_blacklist import token_blacklist, is_token_revoked
 from ..db.redis import redis_client, get_redis
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-# Import AsyncSession with proper fallback
-try:
-    from sqlalchemy.ext.asyncio import AsyncSession
-except ImportError:
-    # For older SQLAlchemy versions or when async is not available
-    from sqlalchemy.orm import Session as AsyncSession
-
-# Ensure consistent imports for user functions
-try:
-    from .user import get_user_by_email, get_user_by_username
-except ImportError:
-    # Define fallback functions if import fails
-    async def get_user_by_email(db, email):
-        return db.query(UserInDB).filter(UserInDB.email.ilike(email)).first()
-    
-    async def get_user_by_username(db, username):
-        return db.query(UserInDB).filter(UserInDB.username.ilike(username)).first()
-
+from .user import get_user_by_email, get_user_by_username
 from ..database import get_db
 
 # Security configuration - Updated to use settings
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    default="argon2",
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/token")
 
+# Legacy bcrypt hashes are checked with the bcrypt C binding directly,
+# skipping passlib's scheme lookup and backend wrapper
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+# The argon2 handler with the context's cost settings applied, resolved once
+# so hashing doesn't go through CryptContext's scheme dispatch on every call
+_ARGON2 = pwd_context.handler("argon2")
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
+    if hashed_password.startswith("$argon2"):
+        return _ARGON2.verify(plain_password, hashed_password)
+    if hashed_password.startswith(_BCRYPT_PREFIXES):
+        # bcrypt only reads the first 72 bytes; passlib truncated the same way
+        return bcrypt.checkpw(plain_password.encode()[:72], hashed_password.encode())
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Generate password hash."""
-    return pwd_context.hash(password)
+    return _ARGON2.hash(password)
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True for bcrypt hashes and argon2 hashes below the configured cost."""
+    return pwd_context.needs_update(hashed_password)
+
+# Recently verified (password, hash) pairs, keyed by an HMAC so the
+# plaintext is never held. Only successes are cached; a password change
+# produces a new hash and therefore a new key.
+VERIFY_CACHE_TTL = 30
+VERIFY_CACHE_SIZE = 10_000
+_verify_cache: "OrderedDict[bytes, float]" = OrderedDict()
+
+def _verify_cache_key(plain_password: str, hashed_password: str) -> bytes:
+    return hmac.new(
+        settings.SECRET_KEY.encode(),
+        f"{plain_password}|{hashed_password}".encode(),
+        hashlib.sha256
+    ).digest()
+
+# The KDF is deliberately slow CPU work; run it in a worker thread so it
+# doesn't stall every other request on the event loop. It gets its own pool,
+# sized to the cores, so a burst of logins can't occupy the default executor
+# that other asyncio.to_thread calls share
+_KDF_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="kdf")
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash off the event loop."""
+    key = _verify_cache_key(plain_password, hashed_password)
+    now = monotonic()
+    verified_at = _verify_cache.get(key)
+    if verified_at is not None and now - verified_at < VERIFY_CACHE_TTL:
+        return True
+    
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(_KDF_POOL, verify_password, plain_password, hashed_password):
+        return False
+    
+    _verify_cache[key] = now
+    _verify_cache.move_to_end(key)
+    if len(_verify_cache) > VERIFY_CACHE_SIZE:
+        _verify_cache.popitem(last=False)
+    return True
+
+async def get_password_hash_async(password: str) -> str:
+    """Generate password hash off the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(_KDF_POOL, get_password_hash, password)
+
+# Hash of a random password, made on first use; unknown identifiers are
+# checked against it so they take as long as a wrong password for a real
+# user and response time doesn't reveal which accounts exist
+_dummy_hash: Optional[str] = None
+
+async def verify_dummy_password(plain_password: str) -> None:
+    """Spend one KDF verification for a login whose user wasn't found."""
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = await get_password_hash_async(secrets.token_urlsafe(16))
+    await asyncio.get_running_loop().run_in_executor(_KDF_POOL, verify_password, plain_password, _dummy_hash)
+
+def _b64url(raw: bytes) -> bytes:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=")
+
+# HMAC tokens are signed here directly. Their header never changes, so it is
+# serialized and base64url-encoded once instead of for every token
+# Digest names rather than constructors: hmac.digest() then takes OpenSSL's
+# one-shot HMAC path (SHA extensions where the CPU has them)
+_HMAC_DIGESTS = {"HS256": "sha256", "HS384": "sha384", "HS512": "sha512"}
+_JWT_HEADER_B64 = _b64url(orjson.dumps({"alg": settings.ALGORITHM, "typ": "JWT"}))
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=15))
+    to_encode = {**data, "exp": calendar.timegm(expire.utctimetuple())}
+    digest = _HMAC_DIGESTS.get(settings.ALGORITHM)
+    if digest is None:
+        return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    signing_input = _JWT_HEADER_B64 + b"." + _b64url(orjson.dumps(to_encode))
+    signature = _b64url(hmac.digest(settings.SECRET_KEY.encode(), signing_input, digest))
+    return (signing_input + b"." + signature).decode()
 
 async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ):
-    """Get current user from JWT token."""
+    """Get current user from JWT token.
+    
+    The resolved user is cached on ``request.state.user`` so any other code
+    handling the same request reuses it instead of re-decoding the token.
+    """
+    cached_user = getattr(request.state, "user", None)
+    if cached_user is not None:
+        return cached_user
+    
     import logging
     logger = logging.getLogger(__name__)
     
@@ -74,15 +170,15 @@ async def get_current_user(
     try:
         # Log token details for debugging (not in production)
         if not settings.TOKEN_DEBUG:
-            logger.debug(f"Processing authentication token")
+            logger.debug("Processing authentication token")
         else:
-            logger.debug(f"Processing token: {token[:10]}...")
+            logger.debug("Processing token: %s...", token[:10])
         
         # Decode the token
         try:
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         except JWTError as e:
-            logger.warning(f"JWT decode error: {str(e)}")
+            logger.warning("JWT decode error: %s", e)
             raise credentials_exception
             
         # Extract subject (email)
@@ -94,7 +190,7 @@ async def get_current_user(
         # Check token expiration explicitly
         exp = payload.get("exp")
         if not exp or datetime.fromtimestamp(exp) < datetime.utcnow():
-            logger.warning(f"Token expired: {email}")
+            logger.warning("Token expired: %s", email)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token has expired",
@@ -102,53 +198,58 @@ async def get_current_user(
             )
         
         # Check Redis blacklist if available
-        if redis_client:
+        # Only tokens in the local blacklist snapshot need a Redis round-trip
+        if redis_client and token_blacklist.might_contain(token):
             try:
                 redis = await get_redis()
-                if redis and await redis.exists(f"blacklist:{token}"):
-                    logger.warning(f"Token blacklisted: {email}")
+                if redis and await is_token_revoked(redis, token):
+                    logger.warning("Token blacklisted: %s", email)
                     raise HTTPException(
                         status_code=status.HTTP_401_UNAUTHORIZED,
                         detail="Token has been revoked",
                         headers={"WWW-Authenticate": "Bearer"},
                     )
+            except HTTPException:
+                raise
             except Exception as e:
                 # If Redis check fails, log but continue
-                logger.error(f"Redis blacklist check failed: {str(e)}")
+                logger.error("Redis blacklist check failed: %s", e)
         
         # Get user from database
         try:
             user = await get_user_by_email(db, email)
             if not user:
-                logger.warning(f"User not found: {email}")
+                logger.warning("User not found: %s", email)
                 raise credentials_exception
                 
             # Check if user is active
             if not getattr(user, 'is_active', True):
-                logger.warning(f"Inactive user: {email}")
+                logger.warning("Inactive user: %s", email)
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="User account is disabled",
                     headers={"WWW-Authenticate": "Bearer"},
                 )
                 
+            request.state.user = user
             return user
         except Exception as e:
-            logger.error(f"Database error retrieving user {email}: {str(e)}")
+            logger.error("Database error retrieving user %s: %s", email, e)
             raise credentials_exception
             
     except HTTPException:
         # Re-raise HTTP exceptions
         raise
     except Exception as e:
-        logger.error(f"Unexpected error in authentication: {str(e)}", exc_info=True)
+        logger.error("Unexpected error in authentication: %s", e, exc_info=True)
         raise credentials_exception
 
 async def authenticate_user(db, email: str, password: str):
     """Authenticate user with email and password"""
     user = await get_user_by_email(db, email)
     if not user:
+        await verify_dummy_password(password)
         return None  # Return None instead of False for async consistency
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
     return user
\ No newline at end of file
@@ -1,16 +1,6 @@
-import sys
-import logging
-import subprocess
 import os
 
-# Try to import pydantic_settings
-try:
-    from pydantic_settings import BaseSettings
-except ImportError:
-    logging.warning("pydantic-settings not found. Attempting to install it...")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "pydantic-settings>=2.0.0"])
-    from pydantic_settings import BaseSettings
-
+from pydantic_settings import BaseSettings
 from pydantic import Field, PostgresDsn, HttpUrl, validator, AnyUrl
 from typing import Optional, Union, Any, List, Dict
 import secrets
@@ -23,6 +13,13 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Password hashing cost. New hashes use argon2id; bcrypt is kept to
+    # verify (and transparently upgrade) existing hashes
+    ARGON2_TIME_COST: int = Field(2, env="ARGON2_TIME_COST")
+    ARGON2_MEMORY_COST: int = Field(19456, env="ARGON2_MEMORY_COST")  # KiB
+    ARGON2_PARALLELISM: int = Field(1, env="ARGON2_PARALLELISM")
+    BCRYPT_ROUNDS: int = Field(12, env="BCRYPT_ROUNDS")
+    
     # Resource Constraints for Free Tier
     MAX_MEMORY_PERCENT: int = Field(75, env="MAX_MEMORY_PERCENT")
     MAX_CPU_PERCENT: int = Field(70, env="MAX_CPU_PERCENT")
@@ -48,21 +45,34 @@ class Settings(BaseSettings):
     
     # API Configuration
     API_RATE_LIMIT: str = Field("60/minute", env="API_RATE_LIMIT")
+    # Proxies in front of the app that append to X-Forwarded-For; 0 keys
+    # rate limits on the socket peer and ignores the header
+    RATE_LIMIT_TRUSTED_PROXIES: int = Field(0, env="RATE_LIMIT_TRUSTED_PROXIES")
     API_TIMEOUT: int = Field(30, env="API_TIMEOUT")
     
     # Database Configuration - Connection Pooling
     DB_POOL_SIZE: int = Field(3, env="DB_POOL_SIZE")
     DB_MAX_OVERFLOW: int = Field(5, env="DB_MAX_OVERFLOW")
+    # The get_db / async auth engines (app.database) serve every
+    # authenticated request, so only they get a larger pool
+    AUTH_DB_POOL_SIZE: int = Field(10, env="AUTH_DB_POOL_SIZE")
+    AUTH_DB_MAX_OVERFLOW: int = Field(5, env="AUTH_DB_MAX_OVERFLOW")
     DB_POOL_TIMEOUT: int = Field(30, env="DB_POOL_TIMEOUT")
     DB_POOL_RECYCLE: int = Field(1800, env="DB_POOL_RECYCLE")
     
     # Redis Configuration
     REDIS_MAX_CONNECTIONS: int = Field(5, env="REDIS_MAX_CONNECTIONS")
+    # Shared async pool in app.db.redis: rate limiting, login cache, token
+    # blacklist and job state all run on it concurrently with requests
+    REDIS_APP_MAX_CONNECTIONS: int = Field(50, env="REDIS_APP_MAX_CONNECTIONS")
     REDIS_TIMEOUT: int = Field(5, env="REDIS_TIMEOUT")
     REDIS_CACHE_TTL: int = Field(3600, env="REDIS_CACHE_TTL")
     
     # MongoDB Configuration
-    MONGODB_POOL_SIZE: int = Field(5, env="MONGODB_POOL_SIZE")
+    MONGODB_POOL_SIZE: int = Field(10, env="MONGODB_POOL_SIZE")
+    # Warm connections kept by the startup client (app.db.mongodb) only
+    MONGODB_MIN_POOL_SIZE: int = Field(2, env="MONGODB_MIN_POOL_SIZE")
+    MONGODB_MAX_IDLE_TIME_MS: int = Field(300000, env="MONGODB_MAX_IDLE_TIME_MS")
     MONGODB_CONNECT_TIMEOUT_MS: int = Field(5000, env="MONGODB_CONNECT_TIMEOUT_MS")
     MONGODB_SOCKET_TIMEOUT_MS: int = Field(10000, env="MONGODB_SOCKET_TIMEOUT_MS")
     
@@ -72,6 +82,7 @@ class Settings(BaseSettings):
     DROPOUT_RATE: float = 0.2
     EARLY_STOPPING_PATIENCE: int = 2
     EMBEDDING_DIM: int = 16
+    CONTENT_EMBEDDING_DIM: int = 128  # pgvector dimension of Content.embedding
     HIDDEN_LAYERS: str = "[32, 16]"  # Will be parsed from string
     LEARNING_RATE: float = 0.001
     MAX_SEQUENCE_LENGTH: int = 50
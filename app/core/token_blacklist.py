@@ -0,0 +1,118 @@
+"""
+In-process view of the Redis token blacklist.
+
+Every authenticated request used to pay a Redis round-trip to see whether
+its token had been logged out. Nearly all tokens never are, so the worker
+keeps a local copy of the revoked tokens, rebuilt from Redis on a timer,
+and only asks Redis when a token is actually in it.
+
+Revocations live in one sorted set of token digests scored by expiry, so a
+refresh reads just the live entries instead of scanning the keyspace.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from time import monotonic
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+BLACKLIST_KEY = "token_blacklist"
+REFRESH_INTERVAL_SECONDS = 5
+
+# Earlier releases kept one key per revoked token: "blacklist:<token>", then
+# "bl:<digest>". Workers fold any they find into the sorted set for one token
+# lifetime after starting, which outlasts every key an older worker wrote
+LEGACY_RAW_PREFIX = "blacklist:"
+LEGACY_DIGEST_PREFIX = "bl:"
+LEGACY_MIGRATION_INTERVAL_SECONDS = 60
+
+def token_digest(token: str) -> str:
+    # A 64-bit digest instead of the full JWT keeps each entry ~16 bytes
+    # rather than several hundred, in Redis and in the local snapshot
+    return hashlib.blake2b(token.encode(), digest_size=8).hexdigest()
+
+async def revoke_token(redis, token: str, ttl: int):
+    """Blacklist ``token`` for ``ttl`` seconds."""
+    # NX: revoking twice keeps the first expiry
+    await redis.zadd(BLACKLIST_KEY, {token_digest(token): time.time() + ttl}, nx=True)
+
+async def is_token_revoked(redis, token: str) -> bool:
+    digest = token_digest(token)
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.zscore(BLACKLIST_KEY, digest)
+        # Legacy keys not migrated yet (e.g. before this worker's first pass)
+        pipe.exists(f"{LEGACY_DIGEST_PREFIX}{digest}", f"{LEGACY_RAW_PREFIX}{token}")
+        expires_at, legacy = await pipe.execute()
+    return bool(legacy) or (expires_at is not None and expires_at > time.time())
+
+async def migrate_legacy_keys(redis) -> int:
+    """Move per-token blacklist keys into the sorted set; returns how many."""
+    moved = 0
+    for prefix in (LEGACY_RAW_PREFIX, LEGACY_DIGEST_PREFIX):
+        async for key in redis.scan_iter(match=f"{prefix}*", count=1000):
+            ttl = await redis.ttl(key)
+            if ttl > 0:
+                suffix = key[len(prefix):]
+                digest = token_digest(suffix) if prefix == LEGACY_RAW_PREFIX else suffix
+                await redis.zadd(BLACKLIST_KEY, {digest: time.time() + ttl}, gt=True)
+            await redis.delete(key)
+            moved += 1
+    if moved:
+        logger.info("Moved %s legacy blacklist keys into %s", moved, BLACKLIST_KEY)
+    return moved
+
+class TokenBlacklistFilter:
+    """Set of revoked token digests, refreshed from the Redis sorted set.
+
+    ``might_contain`` returning False means the token was not revoked as of
+    the last refresh; tokens revoked by another worker since then are
+    picked up within ``REFRESH_INTERVAL_SECONDS``. Until the first refresh
+    succeeds every token is reported as a candidate, so callers fall back to
+    asking Redis.
+    """
+
+    def __init__(self):
+        self._digests = set()
+        self._added = set()
+        self._ready = False
+
+    def might_contain(self, token: str) -> bool:
+        return not self._ready or token_digest(token) in self._digests
+
+    def add(self, token: str):
+        # Revocations made by this worker take effect immediately; _added
+        # carries them over a refresh that read Redis before they landed
+        digest = token_digest(token)
+        self._digests.add(digest)
+        self._added.add(digest)
+
+    async def refresh(self, redis):
+        now = time.time()
+        added, self._added = self._added, set()
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.zremrangebyscore(BLACKLIST_KEY, "-inf", now)
+            pipe.zrangebyscore(BLACKLIST_KEY, now, "+inf")
+            _, digests = await pipe.execute()
+        self._digests = set(digests) | added | self._added
+        self._ready = True
+
+    async def run(self, redis, interval: float = REFRESH_INTERVAL_SECONDS):
+        migrate_until = monotonic() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        next_migration = 0.0
+        while True:
+            try:
+                now = monotonic()
+                if next_migration <= now < migrate_until:
+                    next_migration = now + LEGACY_MIGRATION_INTERVAL_SECONDS
+                    await migrate_legacy_keys(redis)
+                await self.refresh(redis)
+            except Exception as e:
+                # Keep the previous snapshot; a stale one is still a
+                # superset of everything this worker revoked itself
+                logger.error("Token blacklist refresh failed: %s", e)
+            await asyncio.sleep(interval)
+
+token_blacklist = TokenBlacklistFilter()
@@ -1,36 +1,36 @@
 from sqlalchemy.orm import Session
 from ..models.user import UserInDB
 from typing import Optional
-from sqlalchemy import select
+from sqlalchemy import bindparam, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Built once so each call only binds a value; SQLAlchemy's compiled cache
+# then skips query construction and compilation
+_USER_BY_EMAIL = select(UserInDB).where(func.lower(UserInDB.email) == bindparam("value")).limit(1)
+_USER_BY_USERNAME = select(UserInDB).where(func.lower(UserInDB.username) == bindparam("value")).limit(1)
+
+async def _first_user(db, stmt, value: str) -> Optional[UserInDB]:
+    """Run a lookup on either an AsyncSession or a sync Session"""
+    if isinstance(db, AsyncSession):
+        result = await db.execute(stmt, {"value": value})
+    else:
+        result = db.execute(stmt, {"value": value})
+    return result.scalars().first()
+
 async def get_user_by_email(db, email: str) -> Optional[UserInDB]:
     """Get user by email with support for both sync and async sessions"""
     if not email:
         logger.warning("Email parameter is empty in get_user_by_email")
         return None
-        
-    # Normalize email to lowercase
-    email = email.lower()
     
     try:
-        # Check if the session is async
-        if hasattr(db, 'execute') and callable(getattr(db, 'execute')):
-            try:
-                # Try async approach
-                result = await db.execute(select(UserInDB).filter(UserInDB.email == email))
-                return result.scalars().first()
-            except (TypeError, AttributeError) as e:
-                # Fall back to sync approach if await fails
-                logger.warning(f"Async session failed, falling back to sync: {str(e)}")
-        
-        # Default to synchronous approach
-        return db.query(UserInDB).filter(UserInDB.email == email).first()
+        # Normalize email to lowercase
+        return await _first_user(db, _USER_BY_EMAIL, email.lower())
     except Exception as e:
-        logger.error(f"Error in get_user_by_email: {str(e)}", exc_info=True)
+        logger.error("Error in get_user_by_email: %s", e, exc_info=True)
         return None
 
 async def get_user_by_username(db, username: str) -> Optional[UserInDB]:
@@ -38,22 +38,12 @@ async def get_user_by_username(db, username: str) -> Optional[UserInDB]:
     if not username:
         logger.warning("Username parameter is empty in get_user_by_username")
         return None
-        
+    
     try:
-        # Check if the session is async
-        if hasattr(db, 'execute') and callable(getattr(db, 'execute')):
-            try:
-                # Try async approach
-                result = await db.execute(select(UserInDB).filter(UserInDB.username == username))
-                return result.scalars().first()
-            except (TypeError, AttributeError) as e:
-                # Fall back to sync approach if await fails
-                logger.warning(f"Async session failed, falling back to sync: {str(e)}")
-        
-        # Default to synchronous approach
-        return db.query(UserInDB).filter(UserInDB.username == username).first()
+        # Match case-insensitively via the lower(username) index
+        return await _first_user(db, _USER_BY_USERNAME, username.lower())
     except Exception as e:
-        logger.error(f"Error in get_user_by_username: {str(e)}", exc_info=True)
+        logger.error("Error in get_user_by_username: %s", e, exc_info=True)
         return None
 
 # Add a function to handle both email and username lookups
@@ -62,11 +52,9 @@ async def get_user_by_identifier(db, identifier: str) -> Optional[UserInDB]:
     if not identifier:
         logger.warning("Identifier parameter is empty in get_user_by_identifier")
         return None
-        
-    # First try email lookup
-    user = await get_user_by_email(db, identifier)
-    if user:
-        return user
-        
-    # Then try username lookup
-    return await get_user_by_username(db, identifier)
\ No newline at end of file
+    
+    # UserCreate only allows alphanumeric usernames, so an '@' means an
+    # email; either way it's a single probe on one lower() index
+    if "@" in identifier:
+        return await get_user_by_email(db, identifier)
+    return await get_user_by_username(db, identifier)
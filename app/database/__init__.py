@@ -1,5 +1,5 @@
 # This file makes the directory a Python package 
-from .postgresql import test_database_connection, engine, Base, get_db, init_db, UserInDB
+from .postgresql import test_database_connection, engine, async_engine, Base, get_db, get_async_db, init_db, UserInDB
 
 # Import Redis and MongoDB with proper error handling
 try:
@@ -12,7 +12,7 @@ try:
 except ImportError:
     mongodb = None
 
-__all__ = ['test_database_connection', 'engine', 'Base', 'get_db', 'init_db', 'UserInDB', 'redis_client', 'mongodb'] 
+__all__ = ['test_database_connection', 'engine', 'async_engine', 'Base', 'get_db', 'get_async_db', 'init_db', 'UserInDB', 'redis_client', 'mongodb'] 
 
 # Expose important functions and classes
 test_database_connection = test_database_connection
@@ -1,12 +1,13 @@
 from pydantic_settings import BaseSettings
 import os
 import logging
-import uuid
 from sqlalchemy import create_engine, Column, Integer, String, text, Boolean, DateTime
 from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from ..core.config import settings
+from ..utils.ids import uuid7
 from datetime import datetime
 
 # Configure logging
@@ -33,11 +34,37 @@ if DATABASE_URL.startswith("sqlite"):
     engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
     logger.info("Using SQLite database")
 else:
-    engine = create_engine(DATABASE_URL)
+    # Sized so concurrent requests don't queue on the pool; pre-ping drops
+    # dead connections before use and recycle beats server idle timeouts
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=settings.AUTH_DB_POOL_SIZE,
+        max_overflow=settings.AUTH_DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True
+    )
     logger.info("Using PostgreSQL database")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for request handlers, so DB I/O doesn't block the event loop
+if DATABASE_URL.startswith("sqlite"):
+    ASYNC_DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    async_engine = create_async_engine(ASYNC_DATABASE_URL)
+else:
+    ASYNC_DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_size=settings.AUTH_DB_POOL_SIZE,
+        max_overflow=settings.AUTH_DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True
+    )
+
+AsyncSessionLocal = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
 # Create declarative base
 Base = declarative_base()
 
@@ -45,7 +72,7 @@ Base = declarative_base()
 class UserInDB(Base):
     __tablename__ = "users"
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=lambda: str(uuid7()))
     email = Column(String, unique=True, nullable=True)
     username = Column(String, unique=True, nullable=True)
     hashed_password = Column(String, nullable=True)
@@ -74,6 +101,11 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """Get asynchronous database session."""
+    async with AsyncSessionLocal() as session:
+        yield session
+
 def test_database_connection():
     """Test the database connection by executing a simple query"""
     try:
@@ -17,6 +17,7 @@ try:
         max_overflow=settings.DB_MAX_OVERFLOW,
         pool_timeout=settings.DB_POOL_TIMEOUT,
         pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True,
         # Echo SQL in debug mode
         echo=(settings.LOG_LEVEL == "DEBUG")
     )
@@ -43,7 +44,7 @@ try:
             retryReads=True,
             # Free tier optimizations
             appname="ai-recommendation-api",
-            maxIdleTimeMS=30000  # 30 seconds
+            maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS
         )
         mongodb = mongo_client[settings.MONGODB_DB_NAME]
         logger.info(f"Successfully connected to MongoDB with pool_size={settings.MONGODB_POOL_SIZE}")
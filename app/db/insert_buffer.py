@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import weakref
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Queued after the last document by close(); the flusher writes what it
+# holds and exits when it reaches it
+_STOP = object()
+
+# Every buffer that has been used, so shutdown can close them all
+_buffers: "weakref.WeakSet[InsertBuffer]" = weakref.WeakSet()
+
+class InsertBuffer:
+    """Batches documents for a Mongo collection into one insert_many per flush.
+
+    High-rate writes (impressions, interactions) are queued in-process and
+    written every ``flush_interval`` seconds or once ``max_batch`` are
+    waiting, whichever comes first. 1000 documents per batch stays under
+    the point where the server splits the batch itself.
+    """
+
+    def __init__(self, collection, max_batch: int = 1000, flush_interval: float = 0.05):
+        self.collection = collection
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.dropped = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, document: dict):
+        """Queue a document; starts the flusher on first use."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            _buffers.add(self)
+        self.queue.put_nowait(document)
+
+    def _drain(self, batch: List[dict]) -> bool:
+        """Fill ``batch`` from the queue; True once the stop marker is reached."""
+        while len(batch) < self.max_batch and not self.queue.empty():
+            document = self.queue.get_nowait()
+            if document is _STOP:
+                return True
+            batch.append(document)
+        return False
+
+    async def _insert(self, batch: List[dict]):
+        # Unordered so one bad/duplicate document doesn't drop the rest
+        await self.collection.insert_many(batch, ordered=False)
+
+    async def _write(self, batch: List[dict]):
+        if not batch:
+            return
+        try:
+            await self._insert(batch)
+        except Exception as e:
+            self.dropped += len(batch)
+            logger.error("Batched insert of %s documents failed (%s dropped so far): %s",
+                         len(batch), self.dropped, e)
+            logger.debug("Dropped documents: %s", batch)
+
+    async def _run(self):
+        while True:
+            document = await self.queue.get()
+            if document is _STOP:
+                return
+            batch = [document]
+            if self.queue.qsize() + 1 < self.max_batch:
+                await asyncio.sleep(self.flush_interval)
+            stop = self._drain(batch)
+            await self._write(batch)
+            if stop:
+                return
+
+    async def flush(self):
+        """Write everything currently queued."""
+        while not self.queue.empty():
+            batch: List[dict] = []
+            self._drain(batch)
+            await self._write(batch)
+
+    async def close(self):
+        """Let the flusher write the batch it holds, then persist the rest."""
+        if self._task is not None and not self._task.done():
+            self.queue.put_nowait(_STOP)
+            await self._task
+        self._task = None
+        await self.flush()
+
+async def close_all_buffers():
+    """Close every buffer in use; called at shutdown before Mongo closes."""
+    for buffer in list(_buffers):
+        try:
+            await buffer.close()
+        except Exception as e:
+            logger.error("Error closing insert buffer: %s", e)
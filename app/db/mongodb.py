@@ -13,8 +13,16 @@ class MongoDB:
     
     async def connect(self):
         try:
-            self.client = AsyncIOMotorClient(settings.MONGODB_URI)
+            self.client = AsyncIOMotorClient(
+                settings.MONGODB_URI,
+                maxPoolSize=settings.MONGODB_POOL_SIZE,
+                minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+                maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS
+            )
             self.db = self.client[settings.MONGODB_DB_NAME]
+            # Pay the handshake now rather than on the first request; the
+            # driver then fills the pool up to minPoolSize in the background
+            await self.client.admin.command("ping")
             logger.info("Connected to MongoDB.")
         except Exception as e:
             logger.error(f"Could not connect to MongoDB: {e}")
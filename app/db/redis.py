@@ -1,11 +1,20 @@
 from redis import asyncio as aioredis
 from ..core.config import settings
 
-redis_client = aioredis.from_url(
+# One bounded connection pool shared by the app, the rate limiter and the
+# scheduler, so every worker reuses sockets instead of dialing per call.
+# The blocking pool makes a burst wait up to REDIS_TIMEOUT for a free
+# connection instead of failing with "Too many connections"
+redis_pool = aioredis.BlockingConnectionPool.from_url(
     settings.REDIS_URL,
     decode_responses=True,
-    encoding="utf-8"
+    encoding="utf-8",
+    max_connections=settings.REDIS_APP_MAX_CONNECTIONS,
+    timeout=settings.REDIS_TIMEOUT,
+    socket_timeout=settings.REDIS_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_TIMEOUT
 )
+redis_client = aioredis.Redis(connection_pool=redis_pool)
 
 async def get_redis():
-    return redis_client
\ No newline at end of file
+    return redis_client
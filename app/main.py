@@ -1,113 +1,158 @@
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
-from fastapi.middleware.cors import CORSMiddleware
-from .routes import auth, recommendations, external, data, dataset, admin
+from fastapi import FastAPI
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, Response
+from starlette.applications import Starlette
+from starlette.routing import Route
+from .routes import auth, recommendations, external
 from .routes import health as health_router  # Rename the import to avoid collision
 from .core.config import settings
+from .middleware.cors import PathFilteredCORSMiddleware
+from .middleware.dispatch import PrefixDispatchMiddleware
+from .middleware.error_handler import ErrorHandlerMiddleware, validation_exception_handler
+from .middleware.rate_limit import limit_requests, setup_rate_limiting
+from .utils.clock import iso_now
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 import importlib
 import os
+import sys
 import gc
-from datetime import datetime, timedelta
-import time
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
+import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 
-# Create rate limiter
-limiter = Limiter(key_func=get_remote_address)
+# Environment flags are fixed for the process lifetime; resolve them once
+_ENV = "production" if os.getenv("ENV") == "production" else "development"
 
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
-)
+# Resolve the process handle and total memory once; /ping only needs RSS
+try:
+    import psutil
+    _PROC = psutil.Process(os.getpid())
+    _TOTAL_MEM = psutil.virtual_memory().total
+except ImportError:
+    _PROC = None
+    _TOTAL_MEM = 0
+
+# Background tasks started during startup and cancelled on shutdown
+_background_tasks = []
 
-# Add rate limiter to the app
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# Full collections walk every tracked object, so run them on a timer
+# instead of inside request handlers
+GC_INTERVAL_SECONDS = 300
 
-@app.middleware("http")
-async def global_error_handler(request: Request, call_next):
+async def _periodic_gc():
+    while True:
+        await asyncio.sleep(GC_INTERVAL_SECONDS)
+        gc.collect(2)
+
+async def _init_mongo():
     try:
-        response = await call_next(request)
-        # Handle streaming responses differently
-        if hasattr(response, 'body'):
-            if response.status_code >= 400:
-                return JSONResponse(
-                    content={
-                        "detail": response.body.decode('utf-8') if response.body else "Unknown error",
-                        "status_code": response.status_code
-                    },
-                    status_code=response.status_code
-                )
-        return response
+        from .db.mongodb import mongodb
+        await mongodb.connect()
+        logger.info("Connected to MongoDB")
+    except ImportError:
+        logger.warning("MongoDB module not available")
     except Exception as e:
-        logger.error(f"Unhandled error: {str(e)}")
-        return JSONResponse(
-            status_code=500,
-            content={
-                "detail": "Internal server error",
-                "status_code": 500
-            }
-        )
+        logger.error("Error connecting to MongoDB: %s", e)
 
-# CORS middleware configuration
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        settings.FRONTEND_URL,
-        "http://localhost:3000",
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+async def _init_postgres():
+    # Open the first pooled connection at startup instead of on a request
+    try:
+        from sqlalchemy import text
+        from .database import async_engine
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        logger.info("Connected to PostgreSQL")
+    except ImportError:
+        logger.warning("Database module not available")
+    except Exception as e:
+        logger.error("Error connecting to PostgreSQL: %s", e)
 
-@app.on_event("startup")
-async def startup_event():
+def _bind_redis(app: FastAPI) -> None:
+    """Import the Redis client once and record whether its API is async."""
+    try:
+        from .db.redis import redis_client
+    except ImportError:
+        logger.warning("Redis module not available")
+        redis_client = None
+    app.state.redis = redis_client
+    app.state.redis_is_async = asyncio.iscoroutinefunction(getattr(redis_client, "ping", None))
+    # The client doesn't own a pool it was handed, so disconnect the pool
+    # itself; otherwise fall back to close() (aclose() in redis-py 5)
+    app.state.redis_close = (
+        getattr(getattr(redis_client, "connection_pool", None), "disconnect", None)
+        or getattr(redis_client, "aclose", None)
+        or getattr(redis_client, "close", None)
+    )
+
+async def _redis_call(app: FastAPI, method) -> None:
+    # Sync clients would block the event loop, so push them to a thread
+    if app.state.redis_is_async:
+        await method()
+    else:
+        await asyncio.to_thread(method)
+
+async def _init_redis(app: FastAPI):
+    if app.state.redis is None:
+        return
+    try:
+        await _redis_call(app, app.state.redis.ping)
+        logger.info("Connected to Redis")
+    except Exception as e:
+        logger.error("Error connecting to Redis: %s", e)
+
+async def _startup(app: FastAPI):
     logger.info("Starting up application...")
     
+    # One pooled client for outbound calls, so keep-alive connections are
+    # reused instead of paying DNS + TCP + TLS setup per request
+    app.state.http = httpx.AsyncClient(
+        timeout=10.0,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    )
+    
     # Start the Render optimizer for free tier
     try:
         from .utils.render_optimizer import start_render_optimizer, get_render_info
         optimizer_started = start_render_optimizer()
         if optimizer_started:
-            render_info = get_render_info()
-            logger.info(f"Render optimizer started for free tier environment: {render_info}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Render optimizer started for free tier environment: %s", get_render_info())
         else:
             logger.info("Render optimizer not needed for this environment")
+            # The optimizer already collects garbage periodically on Render
+            if settings.ENABLE_MEMORY_OPTIMIZATION:
+                _background_tasks.append(asyncio.create_task(_periodic_gc()))
     except ImportError:
         logger.warning("Render optimizer module not available")
     except Exception as e:
-        logger.error(f"Error starting Render optimizer: {str(e)}")
+        logger.error("Error starting Render optimizer: %s", e)
     
-    # Import modules with safe error handling
-    try:
-        from .db.mongodb import mongodb
-        await mongodb.connect()
-        logger.info("Connected to MongoDB")
-    except ImportError:
-        logger.warning("MongoDB module not available")
-    except Exception as e:
-        logger.error(f"Error connecting to MongoDB: {str(e)}")
+    # Database connections are independent, so open them concurrently
+    _bind_redis(app)
+    results = await asyncio.gather(
+        _init_mongo(), _init_postgres(), _init_redis(app), return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.error("Error during startup: %s", result)
     
-    try:
-        from .db.redis import redis_client
-        await redis_client.ping()
-        logger.info("Connected to Redis")
-    except ImportError:
-        logger.warning("Redis module not available")
-    except Exception as e:
-        logger.error(f"Error connecting to Redis: {str(e)}")
+    # Keep the local token blacklist snapshot in sync with Redis
+    if app.state.redis is not None and app.state.redis_is_async:
+        from .core.token_blacklist import token_blacklist
+        _background_tasks.append(asyncio.create_task(token_blacklist.run(app.state.redis)))
     
-    logger.info(f"API Version: {settings.API_V1_STR}")
-    logger.info(f"Environment: {'development' if 'localhost' in settings.FRONTEND_URL else 'production'}")
+    logger.info(
+        "API Version: %s, Environment: %s",
+        settings.API_V1_STR,
+        "development" if "localhost" in settings.FRONTEND_URL else "production"
+    )
     
     # Initialize and start the model retraining scheduler
     try:
-        from .services.scheduler import init_scheduler, get_scheduler
+        from .services.scheduler import init_scheduler
         
         # Get retraining configuration from settings
         retraining_interval = getattr(settings, "MODEL_RETRAINING_INTERVAL_HOURS", 72)
@@ -125,27 +170,50 @@ async def startup_event():
             batch_size=batch_size
         )
         scheduler.start()
-        logger.info(f"Model retraining scheduler started with interval {retraining_interval} hours and threshold {interaction_threshold} interactions")
+        logger.info("Model retraining scheduler started with interval %s hours and threshold %s interactions", retraining_interval, interaction_threshold)
     except ImportError:
         logger.warning("Scheduler module not available, model retraining will be disabled")
     except Exception as e:
-        logger.error(f"Error starting model retraining scheduler: {str(e)}")
+        logger.error("Error starting model retraining scheduler: %s", e)
 
-@app.on_event("shutdown")
-async def shutdown_event():
+async def _shutdown(app: FastAPI):
     logger.info("Shutting down application...")
     
+    for task in _background_tasks:
+        task.cancel()
+    _background_tasks.clear()
+    
+    try:
+        await app.state.http.aclose()
+    except Exception as e:
+        logger.error("Error closing HTTP client: %s", e)
+    
     # Stop the scheduler if it's running
     try:
         from .services.scheduler import get_scheduler
         scheduler = get_scheduler()
         if scheduler:
-            scheduler.stop()
+            await scheduler.stop()
             logger.info("Model retraining scheduler stopped")
     except ImportError:
         pass
     except Exception as e:
-        logger.error(f"Error stopping scheduler: {str(e)}")
+        logger.error("Error stopping scheduler: %s", e)
+    
+    # Persist batched writes while the database clients are still open
+    try:
+        from .db.insert_buffer import close_all_buffers
+        await close_all_buffers()
+    except Exception as e:
+        logger.error("Error flushing insert buffers: %s", e)
+    
+    # Only if something imported it; importing here would open a new client
+    mongo_client = sys.modules.get(f"{__package__}.nosql.mongo_client")
+    if mongo_client is not None:
+        try:
+            await mongo_client.close()
+        except Exception as e:
+            logger.error("Error closing interaction store: %s", e)
     
     # Close database connections
     try:
@@ -155,69 +223,146 @@ async def shutdown_event():
     except (ImportError, AttributeError):
         pass
     except Exception as e:
-        logger.error(f"Error closing MongoDB connection: {str(e)}")
+        logger.error("Error closing MongoDB connection: %s", e)
     
+    if app.state.redis_close is not None:
+        try:
+            await _redis_call(app, app.state.redis_close)
+            logger.info("Redis connection closed")
+        except Exception as e:
+            logger.error("Error closing Redis connection: %s", e)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await _startup(app)
     try:
-        from .db.redis import redis_client
-        await redis_client.close()
-        logger.info("Redis connection closed")
-    except (ImportError, AttributeError):
-        pass
-    except Exception as e:
-        logger.error(f"Error closing Redis connection: {str(e)}")
+        yield
+    finally:
+        await _shutdown(app)
+
+app = FastAPI(
+    title=settings.PROJECT_NAME,
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+
+# Redis-backed rate limiting for endpoints tagged with @limit_requests
+setup_rate_limiting(app)
+
+# Convert unhandled exceptions into JSON 500 responses
+app.add_middleware(ErrorHandlerMiddleware)
+app.add_exception_handler(RequestValidationError, validation_exception_handler)
+
+# CORS middleware configuration; liveness endpoints skip it entirely
+app.add_middleware(
+    PathFilteredCORSMiddleware,
+    bypass_paths=("/", "/ping", "/health"),
+    allow_origins=[
+        settings.FRONTEND_URL,
+        "http://localhost:3000",
+    ],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# The root payload never changes, so serialize it once at import time
+_ROOT_BYTES = orjson.dumps({"status": "healthy", "message": "AI Content Recommendation API"})
 
 # Root endpoint for health check
 @app.get("/")
 async def root():
-    return {"status": "healthy", "message": "AI Content Recommendation API"}
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
-# Simple ping endpoint to keep the app alive
-@app.get("/ping")
-@limiter.limit("10/minute")
-async def ping(request: Request):
-    """Simple endpoint for keeping the app alive. Can be pinged by an external service."""
-    gc.collect()  # Run garbage collection to free memory
-    memory_info = {}
-    try:
-        import psutil
-        process = psutil.Process(os.getpid())
+def _ping_payload():
+    if _PROC is not None:
+        rss = _PROC.memory_info().rss
         memory_info = {
-            "memory_percent": process.memory_percent(),
-            "memory_mb": process.memory_info().rss / 1024 / 1024
+            "memory_percent": 100 * rss / _TOTAL_MEM,
+            "memory_mb": rss / 1048576
         }
-    except ImportError:
+    else:
         memory_info = {"message": "psutil not available"}
     
     return {
-        "status": "alive", 
-        "timestamp": datetime.now().isoformat(),
+        "status": "alive",
+        "timestamp": iso_now(),
         "memory": memory_info
     }
 
-# Direct health check endpoint (without API prefix)
-@app.get("/health")
-async def health_check():
-    """Basic health check endpoint that matches the one in the health router but is available without the API prefix"""
+# Simple ping endpoint to keep the app alive
+@app.get("/ping")
+@limit_requests("10/minute")
+async def ping():
+    """Simple endpoint for keeping the app alive. Can be pinged by an external service."""
+    return ORJSONResponse(_ping_payload())
+
+# Fallback payload for /health when the resource check fails
+_DEGRADED_SKELETON = {
+    "status": "degraded",
+    "version": "1.0.0",
+    "environment": _ENV,
+    "resources": {
+        "message": "Error checking resources"
+    }
+}
+
+async def _health_payload():
     try:
         from .routes.health import health_check
         return await health_check()
     except Exception as e:
-        logger.error(f"Health check error: {str(e)}")
-        return {
-            "status": "degraded",
-            "version": "1.0.0",
-            "timestamp": datetime.now().isoformat(),
-            "environment": "production" if os.getenv("ENV") == "production" else "development",
-            "resources": {
-                "message": "Error checking resources"
-            }
-        }
+        logger.error("Health check error: %s", e)
+        return {**_DEGRADED_SKELETON, "timestamp": iso_now()}
+
+# Direct health check endpoint (without API prefix)
+@app.get("/health")
+async def health_check():
+    """Basic health check endpoint that matches the one in the health router but is available without the API prefix"""
+    return await _health_payload()
+
+# Bare liveness endpoints for uptime monitors, served ahead of every
+# middleware layer. Point keep-alive pingers at /_live/ping.
+async def _live_ping(request):
+    return ORJSONResponse(_ping_payload())
+
+async def _live_health(request):
+    payload = await _health_payload()
+    if hasattr(payload, "model_dump"):
+        payload = payload.model_dump()
+    return ORJSONResponse(payload)
+
+liveness = Starlette(routes=[
+    Route("/_live/ping", _live_ping),
+    Route("/_live/health", _live_health),
+])
+app.add_middleware(PrefixDispatchMiddleware, prefix="/_live/", target=liveness)
 
 # Include routers
-app.include_router(auth.router, prefix=settings.API_V1_STR, tags=["auth"])
-app.include_router(health_router.router, prefix=settings.API_V1_STR, tags=["health"])  # Use the renamed import
-app.include_router(recommendations.router, prefix=settings.API_V1_STR, tags=["recommendations"])
-app.include_router(external.router, prefix=settings.API_V1_STR, tags=["external"])
-app.include_router(data.router, prefix=settings.API_V1_STR, tags=["data"])
-app.include_router(dataset.router, prefix=settings.API_V1_STR, tags=["dataset"])
-app.include_router(admin.router, prefix=settings.API_V1_STR, tags=["admin"])
\ No newline at end of file
+_PREFIX = settings.API_V1_STR
+_ROUTERS = (
+    (auth, "auth"),
+    (health_router, "health"),
+    (recommendations, "recommendations"),
+    (external, "external"),
+)
+# Data/admin routers pull in pandas and the training stack; import them
+# lazily so a lightweight deployment without those extras still boots
+_OPTIONAL_ROUTERS = (
+    ("data", "data"),
+    ("dataset", "dataset"),
+    ("admin", "admin"),
+)
+
+def _load_optional_routers():
+    loaded = []
+    for name, tag in _OPTIONAL_ROUTERS:
+        try:
+            loaded.append((importlib.import_module(f".routes.{name}", package=__package__), tag))
+        except ImportError as e:
+            logger.warning("Skipping %s router: %s", name, e)
+    return tuple(loaded)
+
+for module, tag in _ROUTERS + _load_optional_routers():
+    app.include_router(module.router, prefix=_PREFIX, tags=[tag])
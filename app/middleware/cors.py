@@ -0,0 +1,22 @@
+from typing import Iterable
+from starlette.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+class PathFilteredCORSMiddleware:
+    """CORSMiddleware that skips paths never fetched cross-origin by browsers.
+
+    Uptime monitors and load balancers poll ``/``, ``/ping`` and ``/health``
+    at high frequency; sending those straight to the inner app avoids the
+    CORS header matching and response wrapping on every hit.
+    """
+
+    def __init__(self, app: ASGIApp, bypass_paths: Iterable[str] = (), **cors_options) -> None:
+        self.app = app
+        self.cors = CORSMiddleware(app, **cors_options)
+        self.bypass_paths = frozenset(bypass_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] in self.bypass_paths:
+            await self.app(scope, receive, send)
+            return
+        await self.cors(scope, receive, send)
@@ -0,0 +1,19 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+class PrefixDispatchMiddleware:
+    """Send requests under ``prefix`` to ``target`` before any other middleware.
+
+    Added last, this sits outermost in the stack, so the target app serves
+    its paths without the CORS, error-handling or rate-limit layers.
+    """
+
+    def __init__(self, app: ASGIApp, prefix: str, target: ASGIApp) -> None:
+        self.app = app
+        self.prefix = prefix
+        self.target = target
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith(self.prefix):
+            await self.target(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
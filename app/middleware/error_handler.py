@@ -1,13 +1,70 @@
 from fastapi import Request
-from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import logging
+import orjson
+
+logger = logging.getLogger(__name__)
+
+_INTERNAL_ERROR_BODY = orjson.dumps({"detail": "Internal server error", "status_code": 500})
+_INTERNAL_ERROR_HEADERS = [
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_INTERNAL_ERROR_BODY)).encode()),
+]
 
 async def error_handler(request: Request, call_next):
     try:
         return await call_next(request)
     except Exception as e:
         logging.error(f"Unhandled error: {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"detail": "Internal server error"}
-        ) 
\ No newline at end of file
+        )
+
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    """Return validation errors in the same shape as other API errors"""
+    return ORJSONResponse(
+        status_code=422,
+        # errors() can carry exception objects in ctx; encode them as
+        # FastAPI's default handler does
+        content={"detail": jsonable_encoder(exc.errors()), "status_code": 422}
+    )
+
+class ErrorHandlerMiddleware:
+    """Pure ASGI middleware that turns unhandled exceptions into a JSON 500.
+
+    Responses pass through untouched; only exceptions raised before the
+    response has started are converted, since headers can't be resent after.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            logger.error("Unhandled error: %s", e)
+            if response_started:
+                raise
+            await send({
+                "type": "http.response.start",
+                "status": 500,
+                "headers": _INTERNAL_ERROR_HEADERS,
+            })
+            await send({"type": "http.response.body", "body": _INTERNAL_ERROR_BODY})
@@ -3,12 +3,12 @@ import logging
 
 async def log_request(request: Request, call_next):
     logger = logging.getLogger("api")
-    logger.info(f"{request.method} {request.url}")
+    logger.info("%s %s", request.method, request.url)
     
     try:
         response = await call_next(request)
-        logger.info(f"Status: {response.status_code}")
+        logger.info("Status: %s", response.status_code)
         return response
     except Exception as e:
-        logger.error(f"Request failed: {str(e)}")
+        logger.error("Request failed: %s", e)
         raise 
\ No newline at end of file
@@ -1,70 +1,175 @@
-from typing import Callable, Dict
-from fastapi import FastAPI, Request, HTTPException
-from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+from fastapi import FastAPI
+from collections import OrderedDict
+from time import monotonic
+from weakref import WeakKeyDictionary
+import itertools
 import logging
-from starlette.responses import JSONResponse
+import time
+import uuid
+import orjson
+from starlette.types import ASGIApp, Receive, Scope, Send
+from ..core.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Store request counts per IP
-request_store: Dict[str, Dict] = {}
+# Seconds per period accepted in limit strings such as "10/minute"
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
 
-def get_client_ip(request: Request) -> str:
-    """Get client IP from request"""
-    forwarded = request.headers.get("X-Forwarded-For")
-    if forwarded:
-        return forwarded.split(",")[0]
-    return request.client.host if request.client else "unknown"
+# Sliding-window log: drop expired entries, count, then record this hit.
+# Runs atomically inside Redis so concurrent workers cannot race.
+_SLIDING_WINDOW_LUA = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+if redis.call('ZCARD', key) >= limit then
+    return 0
+end
+redis.call('ZADD', key, now, ARGV[4])
+redis.call('PEXPIRE', key, window)
+return 1
+"""
+
+_TOO_MANY_REQUESTS_BODY = orjson.dumps({"detail": "Too many requests. Please try again later."})
+_TOO_MANY_REQUESTS_HEADERS = [
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_TOO_MANY_REQUESTS_BODY)).encode()),
+]
+
+# Per-key (count, window_start) used when Redis is unavailable. Bounded LRU so
+# keys from clients that never return don't accumulate forever.
+MAX_TRACKED_CLIENTS = 100_000
+request_store: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+
+def get_client_ip(scope: Scope, trusted_proxies: int = 0) -> str:
+    """Get client IP from an ASGI scope.
+    
+    Clients can put anything in X-Forwarded-For; only the hops our own
+    proxies append are trustworthy. Behind ``trusted_proxies`` of them the
+    client is that many entries from the right. With none, the header is
+    ignored and the socket peer is used.
+    """
+    if trusted_proxies:
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                hops = value.split(b",")
+                if len(hops) >= trusted_proxies:
+                    return hops[-trusted_proxies].strip().decode("latin-1")
+                break
+    client = scope.get("client")
+    return client[0] if client else "unknown"
 
 def is_rate_limited(ip: str, limit: int = 5, window: int = 60) -> bool:
     """Check if request should be rate limited"""
-    now = datetime.now()
+    now = monotonic()
+    entry = request_store.get(ip)
     
-    if ip not in request_store:
-        request_store[ip] = {
-            "count": 1,
-            "window_start": now
-        }
-        return False
-        
-    window_start = request_store[ip]["window_start"]
-    if now - window_start > timedelta(seconds=window):
-        # Reset window
-        request_store[ip] = {
-            "count": 1,
-            "window_start": now
-        }
-        return False
-        
-    request_store[ip]["count"] += 1
-    return request_store[ip]["count"] > limit
-
-def setup_rate_limiting(app: FastAPI) -> None:
-    """Configure rate limiting for the FastAPI application"""
+    if entry is None or now - entry[1] > window:
+        # New client or expired window
+        count = 1
+        request_store[ip] = (count, now)
+    else:
+        count = entry[0] + 1
+        request_store[ip] = (count, entry[1])
     
-    @app.middleware("http")
-    async def rate_limit_middleware(request: Request, call_next: Callable):
-        try:
-            client_ip = get_client_ip(request)
-            
-            if is_rate_limited(client_ip):
-                logger.warning(f"Rate limit exceeded for {client_ip}")
-                return JSONResponse(
-                    status_code=429,
-                    content={"detail": "Too many requests. Please try again later."}
-                )
-            
-            response = await call_next(request)
-            return response
-            
-        except Exception as e:
-            logger.error(f"Rate limiting error: {str(e)}")
-            return await call_next(request)
+    request_store.move_to_end(ip)
+    if len(request_store) > MAX_TRACKED_CLIENTS:
+        request_store.popitem(last=False)
+    return count > limit
+
+def parse_limit(limit_string: str) -> Tuple[int, int]:
+    """Parse a limit string like "10/minute" into (limit, window_ms)"""
+    count, period = limit_string.split("/", 1)
+    return int(count), _PERIODS[period.strip().rstrip("s")] * 1000
+
+# Endpoints tagged by limit_requests -> (limit, window_ms). Weak keys so
+# discarded endpoint functions (e.g. in tests) don't stay referenced.
+_LIMITED_ENDPOINTS: "WeakKeyDictionary[Callable, Tuple[int, int]]" = WeakKeyDictionary()
 
 def limit_requests(limit_string: str):
-    """Decorator for rate limiting individual endpoints"""
+    """Tag an endpoint with a rate limit enforced by RateLimitMiddleware"""
+    parsed = parse_limit(limit_string)
     def decorator(func: Callable) -> Callable:
-        async def wrapper(*args, **kwargs):
-            return await func(*args, **kwargs)
-        return wrapper
-    return decorator
\ No newline at end of file
+        _LIMITED_ENDPOINTS[func] = parsed
+        return func
+    return decorator
+
+class RateLimitMiddleware:
+    """Pure ASGI sliding-window rate limiter backed by a single Redis Lua script.
+
+    Only routes tagged with ``@limit_requests`` are limited; everything else
+    is passed straight through. If Redis is missing or errors, the limit is
+    enforced per process with the in-memory ``request_store`` instead.
+    """
+
+    def __init__(self, app: ASGIApp, redis=None, trusted_proxies: Optional[int] = None) -> None:
+        self.app = app
+        self.trusted_proxies = settings.RATE_LIMIT_TRUSTED_PROXIES if trusted_proxies is None else trusted_proxies
+        if redis is None:
+            try:
+                from ..db.redis import redis_client as redis
+            except ImportError:
+                logger.warning("Redis not available, using in-memory rate limiting")
+        self._script = redis.register_script(_SLIDING_WINDOW_LUA) if redis is not None else None
+        self._path_limits: Optional[Dict[str, Tuple[str, int, int, int]]] = None
+        # ZADD replaces an existing member, so members must be unique across
+        # every replica sharing Redis; PIDs are not (PID 1 in each container)
+        self._member_prefix = f"{uuid.uuid4().hex}:"
+        self._counter = itertools.count()
+
+    def _build_path_limits(self, app) -> Dict[str, Tuple[str, int, int, int]]:
+        # Everything except the client IP is fixed per route, so build the
+        # key prefix and both window units once
+        limits = {}
+        for route in getattr(app, "routes", ()):
+            endpoint = getattr(route, "endpoint", None)
+            limit = _LIMITED_ENDPOINTS.get(endpoint) if endpoint is not None else None
+            if limit is not None:
+                max_requests, window_ms = limit
+                limits[route.path] = (f"ratelimit:{route.path}:", max_requests, window_ms, window_ms // 1000)
+        return limits
+
+    async def _is_allowed(self, key: str, max_requests: int, window_ms: int, window_s: int) -> bool:
+        if self._script is not None:
+            try:
+                return bool(await self._script(
+                    keys=[key],
+                    args=[int(time.time() * 1000), window_ms, max_requests,
+                          f"{self._member_prefix}{next(self._counter)}"]
+                ))
+            except Exception as e:
+                logger.error("Rate limiting error: %s", e)
+        return not is_rate_limited(key, max_requests, window_s)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self._path_limits is None:
+            self._path_limits = self._build_path_limits(scope.get("app"))
+
+        limit = self._path_limits.get(scope["path"])
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        key_prefix, max_requests, window_ms, window_s = limit
+        client_ip = get_client_ip(scope, self.trusted_proxies)
+        if not await self._is_allowed(key_prefix + client_ip, max_requests, window_ms, window_s):
+            logger.warning("Rate limit exceeded for %s", client_ip)
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": _TOO_MANY_REQUESTS_HEADERS,
+            })
+            await send({"type": "http.response.body", "body": _TOO_MANY_REQUESTS_BODY})
+            return
+
+        await self.app(scope, receive, send)
+
+def setup_rate_limiting(app: FastAPI) -> None:
+    """Configure rate limiting for the FastAPI application"""
+    app.add_middleware(RateLimitMiddleware)
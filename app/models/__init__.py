@@ -1,8 +1,9 @@
-from .recommendation import RecommendationResponse
+from .recommendation import RecommendationResponse, RECO_LIST_ADAPTER
 from .user import User, UserCreate, Token, PasswordReset
 
 __all__ = [
     'RecommendationResponse',
+    'RECO_LIST_ADAPTER',
     'User',
     'UserCreate',
     'Token',
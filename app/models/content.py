@@ -1,12 +1,18 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, Text, Float
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float, Index, CheckConstraint
 from sqlalchemy.sql import func
 from ..database import Base
+from ..core.config import settings
 import enum
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, Dict, Any
 from datetime import datetime
 from sqlalchemy.dialects.postgresql import JSONB
 
+try:
+    from pgvector.sqlalchemy import Vector
+except ImportError:
+    Vector = None
+
 class ContentType(str, enum.Enum):
     ARTICLE = "article"
     VIDEO = "video"
@@ -18,10 +24,15 @@ class Content(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     description = Column(Text)
-    content_type = Column(Enum(ContentType), nullable=False)
+    # Plain text + CHECK instead of a PostgreSQL ENUM: no per-row type lookup
+    # and new variants don't need ALTER TYPE. ContentType validates at the API.
+    content_type = Column(String(32), nullable=False)
     url = Column(String(512))
-    metadata = Column(Text)  # JSON field for flexible metadata
-    embedding = Column(Text)  # Store content embedding for similarity search
+    # 'metadata' is reserved on declarative classes; keep the SQL column name
+    meta = Column('metadata', JSONB)  # Flexible metadata, stored natively so no json.loads on read
+    # Native pgvector column: no text round-trip, and similarity search runs
+    # against the HNSW index below. Falls back to Text without pgvector.
+    embedding = Column(Vector(settings.CONTENT_EMBEDDING_DIM) if Vector is not None else Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -34,6 +45,21 @@ class Content(Base):
     publication_date = Column(DateTime)
     read_time = Column(Integer)  # in minutes 
 
+    __table_args__ = (
+        CheckConstraint(
+            "content_type IN (%s)" % ", ".join(f"'{t.value}'" for t in ContentType),
+            name="ck_content_type"
+        ),
+    ) + ((
+        Index(
+            "ix_contents_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"}
+        ),
+    ) if Vector is not None else ())
+
 # Database model for content items
 class ContentItemDB(Base):
     __tablename__ = "content_items"
@@ -46,20 +72,32 @@ class ContentItemDB(Base):
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=True)
     updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
 
+    # jsonb_path_ops GIN index serves @> containment filters, e.g.
+    # ContentItemDB.content_metadata.contains({"source": "x"})
+    __table_args__ = (
+        Index(
+            "ix_content_items_metadata_gin",
+            "content_metadata",
+            postgresql_using="gin",
+            postgresql_ops={"content_metadata": "jsonb_path_ops"}
+        ),
+    )
+
 # Pydantic models
 class ContentItemBase(BaseModel):
     title: str
     description: Optional[str] = None
     content_type: str
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ContentItemCreate(ContentItemBase):
     content_id: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
 
 class ContentItem(ContentItemBase):
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
+
     content_id: str
     metadata: Optional[Dict[str, Any]] = None
     created_at: Optional[datetime] = None
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from enum import Enum
@@ -15,8 +15,7 @@ class ExperimentVariant(BaseModel):
     description: Optional[str] = None
     parameters: Dict[str, Any]
     
-    class Config:
-        arbitrary_types_allowed = True
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True, extra='ignore')
 
 class ExperimentMetrics(BaseModel):
     variant_id: str
@@ -26,16 +25,15 @@ class ExperimentMetrics(BaseModel):
     total_revenue: float = 0.0
     avg_session_duration: float = 0.0
     user_satisfaction: float = 0.0
+    # Derived rates are stored, not computed on every serialization;
+    # call update_rates() after changing the counters
+    ctr: float = 0.0
+    conversion_rate: float = 0.0
     
-    @property
-    def ctr(self) -> float:
-        """Calculate Click-Through Rate."""
-        return self.clicks / self.impressions if self.impressions > 0 else 0
-    
-    @property
-    def conversion_rate(self) -> float:
-        """Calculate Conversion Rate."""
-        return self.conversions / self.clicks if self.clicks > 0 else 0
+    def update_rates(self):
+        """Recompute Click-Through Rate and Conversion Rate from the counters."""
+        self.ctr = self.clicks / self.impressions if self.impressions > 0 else 0.0
+        self.conversion_rate = self.conversions / self.clicks if self.clicks > 0 else 0.0
 
 class ExperimentCreate(BaseModel):
     name: str
@@ -59,26 +57,24 @@ class Experiment(BaseModel):
     variants: List[ExperimentVariant]
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
-    metrics: Dict[str, ExperimentMetrics] = {}
+    metrics: Dict[str, ExperimentMetrics] = Field(default_factory=dict)
     traffic_split: Dict[str, float]
     is_active: bool = True
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        use_enum_values = True
-        from_attributes = True
+    model_config = ConfigDict(use_enum_values=True, from_attributes=True)
 
 class UserAssignment(BaseModel):
     user_id: str
     experiment_id: str
     variant_id: str
-    assigned_at: datetime = datetime.utcnow()
+    assigned_at: datetime = Field(default_factory=datetime.utcnow)
 
 class ExperimentEvent(BaseModel):
     user_id: str
     experiment_id: str
     variant_id: str
     event_type: str  # e.g., "impression", "click", "conversion"
-    metadata: Dict[str, Any] = {}
-    timestamp: datetime = datetime.utcnow() 
\ No newline at end of file
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+    timestamp: datetime = Field(default_factory=datetime.utcnow) 
\ No newline at end of file
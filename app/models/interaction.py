@@ -1,10 +1,13 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, Dict, Any
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Numeric
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Numeric, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 from ..database import Base
 
+# Interaction types that carry real preference signal; a small share of rows
+SIGNAL_INTERACTION_TYPES = ("purchase", "like", "bookmark")
+
 # Database model for interactions
 class InteractionDB(Base):
     __tablename__ = "interactions"
@@ -17,20 +20,49 @@ class InteractionDB(Base):
     timestamp = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=True)
     interaction_metadata = Column(JSONB, nullable=True)
 
+    # jsonb_path_ops GIN index serves @> containment filters on metadata
+    __table_args__ = (
+        Index(
+            "ix_interactions_metadata_gin",
+            "interaction_metadata",
+            postgresql_using="gin",
+            postgresql_ops={"interaction_metadata": "jsonb_path_ops"}
+        ),
+        # "latest N interactions for a user" is answered by an index-only
+        # scan; the INCLUDE columns cover the usual projection
+        Index(
+            "ix_interactions_user_time",
+            user_id,
+            timestamp.desc(),
+            postgresql_include=["content_id", "interaction_type", "value"]
+        ),
+        Index("ix_interactions_content", "content_id"),
+        # Partial index over the high-signal rows only
+        Index(
+            "ix_interactions_signal",
+            "user_id",
+            "content_id",
+            postgresql_where=text(
+                "interaction_type IN (%s)" % ", ".join(f"'{t}'" for t in SIGNAL_INTERACTION_TYPES)
+            )
+        ),
+    )
+
 # Pydantic models
 class InteractionBase(BaseModel):
     content_id: str
     interaction_type: str
     value: Optional[float] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class InteractionCreate(InteractionBase):
     user_id: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
 
 class Interaction(InteractionBase):
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
+
     id: int
     user_id: str
     timestamp: datetime
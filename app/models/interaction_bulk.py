@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import List
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from .interaction import InteractionCreate, InteractionDB
+
+# Below this size a multi-row INSERT is cheaper than setting up COPY
+COPY_THRESHOLD = 100
+
+_COPY_COLUMNS = ("user_id", "content_id", "interaction_type", "value", "timestamp", "interaction_metadata")
+_COPY_SQL = (
+    f"COPY {InteractionDB.__tablename__} ({', '.join(_COPY_COLUMNS)}) "
+    # csv writes None and "" alike as an empty unquoted field, which COPY
+    # reads as NULL; the NOT NULL text columns must read it as ""
+    "FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (content_id, interaction_type))"
+)
+
+def _to_row(interaction: InteractionCreate, now: datetime) -> tuple:
+    return (
+        interaction.user_id,
+        interaction.content_id,
+        interaction.interaction_type,
+        interaction.value,
+        now,
+        json.dumps(interaction.metadata) if interaction.metadata is not None else None,
+    )
+
+def bulk_insert_interactions(db: Session, interactions: List[InteractionCreate]) -> int:
+    """Insert many interactions in one round trip and return how many were written.
+
+    Batches of COPY_THRESHOLD or more on PostgreSQL are streamed with COPY,
+    which skips per-statement parse/plan overhead; smaller batches and other
+    dialects use a single executemany INSERT. The caller commits.
+    """
+    if not interactions:
+        return 0
+
+    now = datetime.utcnow()
+    if len(interactions) < COPY_THRESHOLD or db.get_bind().dialect.name != "postgresql":
+        db.execute(insert(InteractionDB), [
+            {
+                "user_id": i.user_id,
+                "content_id": i.content_id,
+                "interaction_type": i.interaction_type,
+                "value": i.value,
+                "timestamp": now,
+                "interaction_metadata": i.metadata,
+            }
+            for i in interactions
+        ])
+        return len(interactions)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for interaction in interactions:
+        writer.writerow(_to_row(interaction, now))
+    buffer.seek(0)
+
+    raw_connection = db.connection().connection
+    with raw_connection.cursor() as cursor:
+        cursor.copy_expert(_COPY_SQL, buffer)
+    return len(interactions)
@@ -1,9 +1,30 @@
+from typing import List, Optional, Tuple
+import numpy as np
 import tensorflow as tf
 from tensorflow.keras import Model
 from tensorflow.keras.layers import Embedding, Dense, Concatenate
 
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+# Catalog-wide queries rerank this many ANN candidates per requested item
+ANN_CANDIDATE_FACTOR = 10
+
+def quantize_rows(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 quantization; returns (int8 rows, float32 scales)"""
+    scale = np.abs(matrix).max(axis=1) / 127.0
+    scale[scale == 0] = 1.0
+    quantized = np.round(matrix / scale[:, None]).astype(np.int8)
+    return quantized, scale.astype(np.float32)
+
+def mixed_precision_policy() -> str:
+    """float16 where tensor cores exist, bfloat16 (AVX-512-BF16/AMX) on CPU"""
+    return "mixed_float16" if tf.config.list_physical_devices("GPU") else "mixed_bfloat16"
+
 class NeuralRecommender(Model):
-    def __init__(self, num_users: int, num_items: int, embedding_dim: int):
+    def __init__(self, num_users: int, num_items: int, embedding_dim: int, mixed_precision: bool = True):
         super().__init__()
         
         # Embeddings
@@ -18,11 +39,18 @@ class NeuralRecommender(Model):
             name="item_embedding"
         )
         
-        # Layers
+        # Layers. The hidden MLP computes in 16-bit (weights stay float32);
+        # the sigmoid output is kept in float32 to avoid overflow
+        policy = mixed_precision_policy() if mixed_precision else None
         self.concat = Concatenate(axis=1)
-        self.dense_1 = Dense(128, activation='relu')
-        self.dense_2 = Dense(64, activation='relu')
-        self.output_layer = Dense(1, activation='sigmoid')
+        self.dense_1 = Dense(128, activation='relu', dtype=policy)
+        self.dense_2 = Dense(64, activation='relu', dtype=policy)
+        self.output_layer = Dense(1, activation='sigmoid', dtype='float32')
+        
+        # int8 embedding snapshots (plus per-row scales) used for inference
+        self._user_q = self._user_scale = None
+        self._item_q = self._item_scale = None
+        self._item_index = None
 
     def call(self, inputs):
         """Forward pass of the model"""
@@ -44,6 +72,106 @@ class NeuralRecommender(Model):
         # Output
         return self.output_layer(x)
 
+    def refresh_embedding_cache(self):
+        """Snapshot both embedding tables as int8; call again after (re)training.
+        
+        Inference reads a quarter of the bytes the float32 tables would need;
+        rows are dequantized only for the candidates being scored.
+        """
+        if not self.built:
+            # Embedding weights only exist once the model has been called
+            self._score(tf.constant([0], tf.int32), tf.constant([0], tf.int32))
+        self._user_q, self._user_scale = quantize_rows(self.user_embedding.embeddings.numpy())
+        self._item_q, self._item_scale = quantize_rows(self.item_embedding.embeddings.numpy())
+        self._item_index = None
+
+    def build_item_index(self):
+        """Build an HNSW index over the item embeddings for catalog-wide top-k.
+        
+        Returns None (and catalog queries fall back to scoring every item)
+        when faiss is not installed.
+        """
+        if faiss is None:
+            return None
+        items = self.get_item_embeddings(np.arange(self.item_embedding.input_dim))
+        index = faiss.IndexHNSWFlat(items.shape[1], 32, faiss.METRIC_INNER_PRODUCT)
+        index.add(np.ascontiguousarray(items, dtype=np.float32))
+        self._item_index = index
+        return index
+
+    def _candidate_items(self, user_id: int, top_k: int) -> np.ndarray:
+        """Items worth scoring for a catalog-wide query"""
+        if self._item_index is None and self.build_item_index() is None:
+            return np.arange(self.item_embedding.input_dim, dtype=np.int32)
+        query = self.get_user_embedding(user_id)[None, :]
+        _, ids = self._item_index.search(query, top_k * ANN_CANDIDATE_FACTOR)
+        return ids[0][ids[0] >= 0].astype(np.int32)
+
+    def get_user_embedding(self, user_id: int) -> np.ndarray:
+        """Return the (dequantized) embedding vector for a single user"""
+        if self._user_q is None:
+            self.refresh_embedding_cache()
+        return self._user_q[user_id].astype(np.float32) * self._user_scale[user_id]
+
+    def get_item_embeddings(self, item_ids: np.ndarray) -> np.ndarray:
+        """Return (dequantized) embedding rows for the given items"""
+        if self._item_q is None:
+            self.refresh_embedding_cache()
+        return self._item_q[item_ids].astype(np.float32) * self._item_scale[item_ids, None]
+
+    @tf.function(input_signature=[tf.TensorSpec([None, None], tf.float32)])
+    def _score_features(self, features):
+        """Run the dense stack over pre-concatenated embeddings; traced once."""
+        x = self.dense_1(features, training=False)
+        x = self.dense_2(x, training=False)
+        return self.output_layer(x, training=False)[:, 0]
+
+    @tf.function(input_signature=[
+        tf.TensorSpec([None], tf.int32),
+        tf.TensorSpec([None], tf.int32)
+    ])
+    def _score(self, user_ids, item_ids):
+        """Full forward pass from raw ids; fixed signature so it traces once."""
+        return self({"user_input": user_ids, "item_input": item_ids}, training=False)
+
+    def predict_score(self, user_id: int, item_id: int) -> float:
+        """Score a single (user, item) pair"""
+        return float(self._score(
+            tf.constant([user_id], tf.int32),
+            tf.constant([item_id], tf.int32)
+        )[0, 0].numpy())
+
+    def get_recommendations(
+        self,
+        user_id: int,
+        item_ids: Optional[List[int]] = None,
+        top_k: int = 10
+    ) -> List[Tuple[int, float]]:
+        """Return the top_k (item_id, score) pairs for a user among item_ids.
+        
+        With item_ids=None the whole catalog is searched: ANN candidates from
+        the item index are reranked by the MLP.
+        """
+        if item_ids is None:
+            items = self._candidate_items(user_id, top_k)
+        else:
+            items = np.asarray(item_ids, dtype=np.int32)
+        if len(items) == 0:
+            return []
+        
+        # One user vector broadcast against the cached item rows, then a
+        # single batched pass through the dense layers for all candidates
+        item_vecs = self.get_item_embeddings(items)
+        user_vecs = np.broadcast_to(self.get_user_embedding(user_id), item_vecs.shape)
+        features = np.concatenate([user_vecs, item_vecs], axis=1)
+        scores = self._score_features(tf.constant(features, dtype=tf.float32))
+        
+        values, indices = tf.math.top_k(scores, k=min(top_k, len(items)))
+        return list(zip(
+            items[indices.numpy()].tolist(),
+            values.numpy().tolist()
+        ))
+
     def build_graph(self):
         """Build the model graph"""
         user_input = tf.keras.Input(shape=(), dtype=tf.float32, name="user_input")
@@ -1,6 +1,6 @@
 from enum import Enum
-from typing import List, Optional, Set
-from pydantic import BaseModel
+from typing import Dict, FrozenSet, List, Optional, Set
+from pydantic import BaseModel, Field
 from datetime import datetime
 
 class Permission(str, Enum):
@@ -99,10 +99,24 @@ ROLE_DEFINITIONS = {
     )
 }
 
+def _resolve_permissions(role: Role) -> FrozenSet[Permission]:
+    """Union a role's permissions with everything inherited from its parents"""
+    definition = ROLE_DEFINITIONS[role]
+    permissions = set(definition.permissions)
+    while definition.parent_role:
+        definition = ROLE_DEFINITIONS[definition.parent_role]
+        permissions |= definition.permissions
+    return frozenset(permissions)
+
+# Role hierarchy resolved once at import; permission checks are a set lookup
+RESOLVED_PERMISSIONS: Dict[Role, FrozenSet[Permission]] = {
+    role: _resolve_permissions(role) for role in ROLE_DEFINITIONS
+}
+
 class UserRole(BaseModel):
     user_id: str
     role: Role
-    assigned_at: datetime = datetime.utcnow()
+    assigned_at: datetime = Field(default_factory=datetime.utcnow)
     assigned_by: Optional[str] = None
 
 class RoleAssignment(BaseModel):
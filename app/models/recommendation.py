@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import List, Optional, Dict, Any, Generic, TypeVar
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 T = TypeVar('T')
 
@@ -12,6 +12,8 @@ class UserProfile(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 class ContentItem(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     content_id: str
     title: str
     description: Optional[str] = None
@@ -21,6 +23,8 @@ class ContentItem(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 class UserInteraction(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
     user_id: str
     content_id: str
     interaction_type: str  # e.g., "view", "like", "purchase"
@@ -43,10 +47,12 @@ class RecommendationResponse(BaseModel):
     category: Optional[str] = None
     image_url: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
-    created_at: datetime = datetime.now()
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
 
-    class Config:
-        from_attributes = True 
+# Built once so list responses don't rebuild the validator/serializer per call
+RECO_LIST_ADAPTER = TypeAdapter(List[RecommendationResponse])
 
 class PaginatedResponse(BaseModel, Generic[T]):
     items: List[T]
@@ -54,5 +60,4 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page: int
     totalPages: int
 
-    class Config:
-        from_attributes = True 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
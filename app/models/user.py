@@ -1,9 +1,8 @@
-from sqlalchemy import Column, String, Boolean, DateTime
+from sqlalchemy import Column, String, Boolean, DateTime, Index
 from sqlalchemy.sql import func
-from pydantic import BaseModel, EmailStr, constr
-from typing import Optional
+from pydantic import AfterValidator, BaseModel, ConfigDict, EmailStr, StringConstraints
+from typing import Annotated, Optional
 from datetime import datetime
-from pydantic import field_validator
 
 from ..db.database import Base
 
@@ -20,6 +19,13 @@ class UserInDB(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Logins match case-insensitively; expression indexes keep those
+    # lookups on an index probe instead of a sequential ILIKE scan
+    __table_args__ = (
+        Index("ix_users_email_lower", func.lower(email), unique=True),
+        Index("ix_users_username_lower", func.lower(username), unique=True),
+    )
+
 class UserBase(BaseModel):
     email: EmailStr
     username: str
@@ -27,30 +33,22 @@ class UserBase(BaseModel):
     oauth_provider: Optional[str] = None
 
 class UserCreate(BaseModel):
-    email: EmailStr
-    password: constr(min_length=8)
-    username: constr(min_length=3, pattern=r'^[a-zA-Z0-9_]+$')
-
-    @field_validator('email')
-    def email_to_lower(cls, v):
-        return v.lower()
-    
-    @field_validator('username')
-    def validate_username(cls, v):
-        if len(v) < 3:
-            raise ValueError('Username must be at least 3 characters')
-        if not v.isalnum():
-            raise ValueError('Username must be alphanumeric')
-        return v
+    # Constraints are declared so pydantic-core enforces them without
+    # calling back into Python validators
+    email: Annotated[EmailStr, AfterValidator(str.lower)]
+    # Passwords are taken verbatim; /token doesn't strip them either
+    password: Annotated[str, StringConstraints(min_length=8, strip_whitespace=False)]
+    username: Annotated[str, StringConstraints(min_length=3, pattern=r'^[A-Za-z0-9]+$')]
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "email": "user@example.com",
-                "password": "securepassword123",
-                "username": "johndoe"
-            }
+    # Surrounding whitespace is stripped from email and username during
+    # parsing, before the constraints above are checked
+    model_config = ConfigDict(str_strip_whitespace=True, json_schema_extra={
+        "example": {
+            "email": "user@example.com",
+            "password": "securepassword123",
+            "username": "johndoe"
         }
+    })
 
 class User(UserBase):
     id: str
@@ -58,8 +56,7 @@ class User(UserBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True  # Formerly known as orm_mode
+    model_config = ConfigDict(from_attributes=True)  # Formerly known as orm_mode
 
 class Token(BaseModel):
     access_token: str
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, Dict, Any
 from datetime import datetime
 from sqlalchemy import Column, String, DateTime, ForeignKey
@@ -18,8 +18,7 @@ class UserProfileDB(Base):
 class UserProfileBase(BaseModel):
     preferences: Optional[Dict[str, Any]] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class UserProfileCreate(UserProfileBase):
     pass
@@ -1,8 +1,22 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.core.config import settings
+from app.db.insert_buffer import InsertBuffer
+from app.models.recommendation import UserInteraction
 
-client = AsyncIOMotorClient(settings.MONGODB_URI)
+client = AsyncIOMotorClient(
+    settings.MONGODB_URI,
+    maxPoolSize=settings.MONGODB_POOL_SIZE,
+    maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS
+)
 db = client.recommendation_engine
 
+# Interactions are coalesced into insert_many batches (up to 1000 docs or 500ms)
+interaction_buffer = InsertBuffer(db.interactions, max_batch=1000, flush_interval=0.5)
+
 async def store_interaction(interaction: UserInteraction):
-    await db.interactions.insert_one(interaction.dict()) 
\ No newline at end of file
+    interaction_buffer.add(interaction.model_dump())
+
+async def close():
+    """Write queued interactions, then close the client"""
+    await interaction_buffer.close()
+    client.close()
@@ -1,7 +1,21 @@
 from typing import List, Optional
+import logging
+from app.db.insert_buffer import InsertBuffer
 from app.db.supabase_client import supabase_client
 from app.models.sql_models import User, Content, UserInteraction
 
+logger = logging.getLogger(__name__)
+
+RECOMMENDATION_COLUMNS = 'id,title,description'
+
+def _interaction_row(interaction: UserInteraction) -> dict:
+    return {
+        'user_id': interaction.user_id,
+        'content_id': interaction.content_id,
+        'interaction_type': interaction.interaction_type,
+        'rating': interaction.rating
+    }
+
 class SupabaseRepository:
     def __init__(self):
         self.client = supabase_client.get_client()
@@ -23,17 +37,34 @@ class SupabaseRepository:
         return response.data
     
     async def store_interaction(self, interaction: UserInteraction) -> dict:
-        response = await self.client.table('user_interactions').insert({
-            'user_id': interaction.user_id,
-            'content_id': interaction.content_id,
-            'interaction_type': interaction.interaction_type,
-            'rating': interaction.rating
-        }).execute()
+        response = await self.client.table('user_interactions').insert(
+            _interaction_row(interaction)
+        ).execute()
         return response.data[0]
     
+    async def store_interactions_bulk(self, interactions: List[UserInteraction]) -> List[dict]:
+        """Insert many interactions with a single PostgREST request"""
+        if not interactions:
+            return []
+        response = await self.client.table('user_interactions').insert(
+            [_interaction_row(i) for i in interactions]
+        ).execute()
+        return response.data
+    
     async def get_user_recommendations(self, user_id: int, limit: int = 10) -> List[dict]:
+        # Only the columns a recommendation card shows; metadata can be large
         response = await self.client.table('contents')\
-            .select('*')\
+            .select(RECOMMENDATION_COLUMNS)\
             .limit(limit)\
             .execute()
-        return response.data 
\ No newline at end of file
+        return response.data
+
+class InteractionBuffer(InsertBuffer):
+    """InsertBuffer that flushes interactions through store_interactions_bulk"""
+
+    def __init__(self, repo: SupabaseRepository, max_batch: int = 1000, flush_interval: float = 0.5):
+        super().__init__(None, max_batch=max_batch, flush_interval=flush_interval)
+        self.repo = repo
+
+    async def _insert(self, batch: List[UserInteraction]):
+        await self.repo.store_interactions_bulk(batch)
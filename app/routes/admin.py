@@ -1,12 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
 
 from ..core.auth import get_current_user
-from ..services.scheduler import get_scheduler
-from ..services.interaction_counter import reset_interaction_counter
+from ..services.scheduler import get_scheduler, get_retraining_job
 from ..core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -22,13 +21,12 @@ class RetrainingResponse(BaseModel):
     success: bool
     message: str
     job_id: Optional[str] = None
-    timestamp: str = datetime.now().isoformat()
+    timestamp: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     details: Optional[Dict[str, Any]] = None
 
 @router.post("/retrain-model", response_model=RetrainingResponse)
 async def trigger_model_retraining(
     request: RetrainingRequest,
-    background_tasks: BackgroundTasks,
     user = Depends(get_current_user)
 ):
     """
@@ -46,7 +44,7 @@ async def trigger_model_retraining(
         )
     
     # Check if retraining is already in progress
-    if hasattr(scheduler, "is_retraining") and scheduler.is_retraining:
+    if scheduler.is_retraining:
         return RetrainingResponse(
             success=False,
             message="Another retraining job is already in progress",
@@ -64,27 +62,8 @@ async def trigger_model_retraining(
     # Generate a job ID based on timestamp
     job_id = f"retrain_{datetime.now().strftime('%Y%m%d%H%M%S')}"
     
-    # Function to run the retraining in the background
-    async def _run_retraining():
-        try:
-            # Set flag to indicate retraining is in progress
-            scheduler.is_retraining = True
-            
-            # Perform the retraining
-            result = await scheduler.retrain_model()
-            
-            # Reset the interaction counter regardless of success
-            await reset_interaction_counter()
-            
-            logger.info(f"Manual retraining completed: {result}")
-        except Exception as e:
-            logger.error(f"Error during manual retraining: {str(e)}")
-        finally:
-            # Clear the retraining flag
-            scheduler.is_retraining = False
-    
-    # Add the retraining task to background tasks
-    background_tasks.add_task(_run_retraining)
+    # No await since the check above, so the job cannot be refused here
+    scheduler.submit_retraining(job_id)
     
     return RetrainingResponse(
         success=True,
@@ -105,62 +84,26 @@ async def get_retraining_job_status(
     """
     Check the status of a retraining job.
     """
-    # Get the scheduler instance
-    scheduler = get_scheduler()
-    if not scheduler:
+    try:
+        state = await get_retraining_job(job_id)
+    except Exception as e:
+        logger.error("Error reading retraining job %s: %s", job_id, e)
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Model retraining scheduler is not available"
+            detail="Retraining job status is not available"
         )
     
-    # Check if a retraining job is in progress
-    is_in_progress = hasattr(scheduler, "is_retraining") and scheduler.is_retraining
-    
-    # In a real implementation, you would store and retrieve job details from a database
-    # For this example, we'll just return the current status based on the is_retraining flag
-    if is_in_progress:
+    if not state:
         return RetrainingResponse(
-            success=True,
-            message="Retraining job is in progress",
+            success=False,
+            message="Retraining job not found",
             job_id=job_id,
-            details={"status": "in_progress"}
+            details={"status": "unknown"}
         )
-    else:
-        # Check when the last retraining happened
-        last_time = scheduler.last_retraining_time
-        
-        if not last_time:
-            return RetrainingResponse(
-                success=False,
-                message="No retraining job has been completed recently",
-                job_id=job_id,
-                details={"status": "unknown"}
-            )
-        
-        # If the job ID matches the format and the last retraining time is after the job ID timestamp
-        try:
-            job_timestamp = datetime.strptime(job_id.split("_")[1], "%Y%m%d%H%M%S")
-            if last_time > job_timestamp:
-                return RetrainingResponse(
-                    success=True,
-                    message="Retraining job completed successfully",
-                    job_id=job_id,
-                    details={
-                        "status": "completed",
-                        "completed_at": last_time.isoformat()
-                    }
-                )
-            else:
-                return RetrainingResponse(
-                    success=False,
-                    message="Retraining job not found or did not complete",
-                    job_id=job_id,
-                    details={"status": "unknown"}
-                )
-        except Exception:
-            return RetrainingResponse(
-                success=False,
-                message="Invalid job ID format",
-                job_id=job_id,
-                details={"status": "error"}
-            ) 
\ No newline at end of file
+    
+    return RetrainingResponse(
+        success=state["status"] not in ("failed", "cancelled"),
+        message=f"Retraining job is {state['status']}",
+        job_id=job_id,
+        details=state
+    )
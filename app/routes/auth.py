@@ -2,16 +2,17 @@ from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import BaseModel, EmailStr, constr
 from datetime import datetime, timedelta
-from passlib.context import CryptContext
-import jwt
 from typing import Optional
-import uuid
-from sqlalchemy.orm import Session
+from types import SimpleNamespace
+import orjson
+from sqlalchemy import func, or_, select, update
 from ..core.config import settings
-from ..database import get_db
+from ..database import get_async_db
 from ..models.user import UserInDB, UserCreate, User, Token, TokenData
-from ..core.auth import get_current_user, verify_password, get_password_hash, create_access_token, get_user_by_email, get_user_by_username
+from ..core.auth import get_current_user, verify_password_async, verify_dummy_password, get_password_hash_async, password_needs_rehash, create_access_token
 from ..core.user import get_user_by_identifier
+from ..core.token_blacklist import token_blacklist, revoke_token
+from ..utils.ids import uuid7
 import logging
 from ..db.redis import redis_client, get_redis
 from redis import asyncio as aioredis
@@ -22,75 +23,120 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/token")
 
+# Login credentials cached briefly so repeated /token calls skip Postgres
+USER_CACHE_TTL = 60
+_USER_CACHE_FIELDS = ("id", "email", "username", "hashed_password", "is_active")
+# Stored for identifiers with no user; create_user deletes it via invalidate_login_user
+_USER_CACHE_MISS = "-"
+
+def _user_cache_key(identifier: str) -> str:
+    return f"user:login:{identifier.lower()}"
+
+async def get_login_user(db: AsyncSession, identifier: str):
+    """get_user_by_identifier behind a short-TTL Redis cache.
+    
+    Misses are cached too, so repeated attempts against unknown identifiers
+    (e.g. credential stuffing) cost one query per identifier per TTL.
+    """
+    key = _user_cache_key(identifier)
+    try:
+        cached = await redis_client.get(key)
+        if cached == _USER_CACHE_MISS:
+            return None
+        if cached:
+            return SimpleNamespace(**orjson.loads(cached))
+    except Exception as e:
+        logger.error("User cache read failed: %s", e)
+    
+    user = await get_user_by_identifier(db, identifier)
+    try:
+        await redis_client.setex(
+            key,
+            USER_CACHE_TTL,
+            _USER_CACHE_MISS if user is None
+            else orjson.dumps({field: getattr(user, field) for field in _USER_CACHE_FIELDS})
+        )
+    except Exception as e:
+        logger.error("User cache write failed: %s", e)
+    return user
+
+async def invalidate_login_user(*identifiers: str):
+    """Drop cached login entries, e.g. after a user is created or changes password"""
+    try:
+        await redis_client.delete(*(_user_cache_key(i) for i in identifiers if i))
+    except Exception as e:
+        logger.error("User cache invalidation failed: %s", e)
+
 # Database operations
-def get_user_by_email(db: Session, email: str):
-    return db.query(UserInDB).filter(UserInDB.email.ilike(email)).first()
+async def get_user_conflict(db: AsyncSession, email: str, username: str):
+    """(email_taken, username_taken) from a single round-trip"""
+    email, username = email.lower(), username.lower()
+    result = await db.execute(
+        select(UserInDB.email, UserInDB.username).where(or_(
+            func.lower(UserInDB.email) == email,
+            func.lower(UserInDB.username) == username
+        ))
+    )
+    rows = result.all()
+    return (
+        any(row.email.lower() == email for row in rows),
+        any(row.username.lower() == username for row in rows)
+    )
 
-def get_user_by_username(db: Session, username: str):
-    return db.query(UserInDB).filter(UserInDB.username.ilike(username)).first()
+async def upgrade_password_hash(db: AsyncSession, user, password: str):
+    """Re-hash a just-verified password at the current scheme and cost"""
+    try:
+        hashed_password = await get_password_hash_async(password)
+        await db.execute(
+            update(UserInDB).where(UserInDB.id == user.id).values(hashed_password=hashed_password)
+        )
+        await db.commit()
+        await invalidate_login_user(user.email, user.username)
+    except Exception as e:
+        await db.rollback()
+        logger.error("Password rehash failed for user %s: %s", user.id, e)
 
-def create_user(db: Session, user_data: dict):
+async def create_user(db: AsyncSession, user_data: dict):
     try:
         db_user = UserInDB(
-            id=str(uuid.uuid4()),
+            id=str(uuid7()),  # time-ordered, so inserts append to the PK index
             email=user_data["email"],
             username=user_data["username"],
             hashed_password=user_data["hashed_password"],
             is_active=True
         )
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        # Every field register reads is set client-side and the session keeps
+        # them after commit (expire_on_commit=False), so no refresh SELECT
+        await db.commit()
+        await invalidate_login_user(db_user.email, db_user.username)
         return db_user
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise e
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = get_user_by_email(db, email)
-    if not user:
-        return False
-    if not verify_password(password, user.hashed_password):
-        return False
-    return user
-
 # Routes
 @router.post("/register", status_code=status.HTTP_201_CREATED)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     try:
-        # Normalize email and username
-        user.email = user.email.strip().lower()
-        user.username = user.username.strip()
-        
+        # UserCreate has already stripped both fields and lowercased the email
         # Check if email or username exists
-        existing_email = get_user_by_email(db, user.email)
-        if existing_email:
+        email_taken, username_taken = await get_user_conflict(db, user.email, user.username)
+        if email_taken:
             raise HTTPException(status_code=400, detail="Email already registered")
-        
-        existing_username = get_user_by_username(db, user.username)
-        if existing_username:
+        if username_taken:
             raise HTTPException(status_code=400, detail="Username already taken")
 
-        # Validate password strength
-        if len(user.password) < 8:
-            raise HTTPException(
-                status_code=400,
-                detail="Password must be at least 8 characters"
-            )
-
-        hashed_password = get_password_hash(user.password)
+        hashed_password = await get_password_hash_async(user.password)
         user_data = {
             "email": user.email,
             "username": user.username,
-            "hashed_password": hashed_password,
-            "is_active": True
+            "hashed_password": hashed_password
         }
         
-        new_user = create_user(db, user_data)
+        new_user = await create_user(db, user_data)
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
             data={"sub": user.email},
@@ -103,13 +149,16 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
             "token_type": "bearer",
             "user_id": str(new_user.id)
         }
+    except HTTPException:
+        # Re-raise HTTP exceptions to preserve status codes
+        raise
     except ValidationError as e:
         raise HTTPException(
             status_code=422,
             detail=e.errors()
         )
     except Exception as e:
-        logger.error(f"Registration error: {str(e)}")
+        logger.error("Registration error: %s", e)
         raise HTTPException(
             status_code=500,
             detail="Registration failed. Please try again later."
@@ -122,18 +171,20 @@ class LoginRequest(BaseModel):
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
         # Normalize input
         input_identifier = form_data.username.strip().lower()
-        logger.info(f"Login attempt with identifier: {input_identifier}")
+        logger.info("Login attempt with identifier: %s", input_identifier)
         
         # Try finding the user by either email or username
-        user = await get_user_by_identifier(db, input_identifier)
+        user = await get_login_user(db, input_identifier)
         
         if not user:
-            logger.warning(f"Login failed: User not found for identifier {input_identifier}")
+            # Same KDF cost as a wrong password, so timing can't enumerate users
+            await verify_dummy_password(form_data.password)
+            logger.warning("Login failed: User not found for identifier %s", input_identifier)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username/email or password",
@@ -141,14 +192,19 @@ async def login_for_access_token(
             )
         
         # Verify password
-        if not verify_password(form_data.password, user.hashed_password):
-            logger.warning(f"Login failed: Invalid password for user {user.id}")
+        if not await verify_password_async(form_data.password, user.hashed_password):
+            logger.warning("Login failed: Invalid password for user %s", user.id)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username/email or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
+        # Move legacy bcrypt (or under-cost) hashes to the current settings
+        # while the plaintext is at hand; each account pays this once
+        if password_needs_rehash(user.hashed_password):
+            await upgrade_password_hash(db, user, form_data.password)
+        
         # Create access token
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
@@ -156,13 +212,13 @@ async def login_for_access_token(
             expires_delta=access_token_expires
         )
         
-        logger.info(f"User {user.id} logged in successfully")
+        logger.info("User %s logged in successfully", user.id)
         return {"access_token": access_token, "token_type": "bearer"}
     except HTTPException:
         # Re-raise HTTP exceptions to preserve status codes
         raise
     except Exception as e:
-        logger.error(f"Login error: {str(e)}", exc_info=True)
+        logger.error("Login error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Login failed. Please try again later."
@@ -173,20 +229,15 @@ async def logout(
     redis: aioredis.Redis = Depends(get_redis),
     token: str = Depends(oauth2_scheme)
 ):
+    # oauth2_scheme already rejects requests without a bearer token (401)
     try:
-        if not token:
-            raise HTTPException(status_code=400, detail="No token provided")
-        
         # Add token to blacklist
-        await redis.setex(
-            f"blacklist:{token}",
-            settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-            "true"
-        )
+        await revoke_token(redis, token, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+        token_blacklist.add(token)
         
         return {"message": "Successfully logged out"}
     except Exception as e:
-        logger.error(f"Logout error: {str(e)}")
+        logger.error("Logout error: %s", e)
         raise HTTPException(
             status_code=500,
             detail="Logout failed. Please try again."
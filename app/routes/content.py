@@ -1,14 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 import logging
 import os
-import json
+import orjson
 from ..core.auth import get_current_user
 from sqlalchemy.orm import Session
 from ..database import get_db
 from ..models.content import ContentItem, ContentItemDB
 from ..models.interaction import InteractionCreate, InteractionDB
+from ..models.interaction_bulk import bulk_insert_interactions
 from ..services.interaction_counter import increment_interaction_counter
 
 logger = logging.getLogger(__name__)
@@ -26,8 +27,7 @@ class MovieResponse(BaseModel):
     genres: List[str] = []
     year: Optional[int] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class MovieInteractionRequest(BaseModel):
     content_id: str
@@ -35,6 +35,13 @@ class MovieInteractionRequest(BaseModel):
     value: float  # For ratings: 1-5
     metadata: Optional[Dict[str, Any]] = None
 
+class MovieInteractionBatchRequest(BaseModel):
+    interactions: List[MovieInteractionRequest] = Field(..., min_length=1, max_length=10000)
+
+class MovieInteractionBatchResponse(BaseModel):
+    count: int
+    status: str = "success"
+
 class MovieInteractionResponse(BaseModel):
     id: int
     user_id: str
@@ -44,20 +51,36 @@ class MovieInteractionResponse(BaseModel):
     timestamp: str
     status: str = "success"
 
+# Parsed content_items.json, shared by all requests and reparsed only when
+# the file changes (the data processor rewrites it in place)
+_content_cache: Dict[str, Any] = {"path": None, "mtime": None, "items": []}
+
+def _content_items_path() -> str:
+    content_path = os.path.join(CONTENT_PATH, 'content_items.json')
+    if not os.path.exists(content_path):
+        # Try sample path
+        content_path = os.path.join(CONTENT_PATH, 'sample', 'content_items.json')
+    return content_path
+
 # Load content from file
 def get_content_items():
+    """Content items from the cache; callers must treat the list as read-only"""
     try:
-        content_path = os.path.join(CONTENT_PATH, 'content_items.json')
-        if not os.path.exists(content_path):
-            # Try sample path
-            content_path = os.path.join(CONTENT_PATH, 'sample', 'content_items.json')
-        
-        with open(content_path, 'r') as f:
-            return json.load(f)
+        content_path = _content_items_path()
+        mtime = os.stat(content_path).st_mtime_ns
+        if _content_cache["path"] != content_path or _content_cache["mtime"] != mtime:
+            with open(content_path, 'rb') as f:
+                items = orjson.loads(f.read())
+            _content_cache.update(path=content_path, mtime=mtime, items=items)
+        return _content_cache["items"]
     except Exception as e:
-        logger.error(f"Error loading content items: {str(e)}")
+        logger.error("Error loading content items: %s", e)
         return []
 
+def invalidate_content_cache():
+    """Force the next get_content_items() call to reread the file"""
+    _content_cache.update(path=None, mtime=None, items=[])
+
 @router.get("/movies", response_model=List[MovieResponse])
 async def get_movies(
     skip: int = 0, 
@@ -108,7 +131,7 @@ async def get_movies(
         
         return result
     except Exception as e:
-        logger.error(f"Error retrieving movies: {str(e)}")
+        logger.error("Error retrieving movies: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve movies: {str(e)}"
@@ -143,7 +166,7 @@ async def get_movie_by_id(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving movie {content_id}: {str(e)}")
+        logger.error("Error retrieving movie %s: %s", content_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve movie: {str(e)}"
@@ -211,12 +234,56 @@ async def create_interaction(
     except Exception as e:
         if db:
             db.rollback()
-        logger.error(f"Error creating interaction: {str(e)}")
+        logger.error("Error creating interaction: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create interaction: {str(e)}"
         )
 
+@router.post("/interact/batch", response_model=MovieInteractionBatchResponse)
+async def create_interactions_batch(
+    batch: MovieInteractionBatchRequest,
+    user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Record many interactions (e.g. an offline client's backlog) in one write"""
+    try:
+        # Validate every content item exists
+        known_ids = {item.get("content_id") for item in get_content_items()}
+        missing = sorted({i.content_id for i in batch.interactions} - known_ids)
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Content not found: {', '.join(missing[:20])}"
+            )
+        
+        count = bulk_insert_interactions(db, [
+            InteractionCreate(
+                user_id=user.id,
+                content_id=interaction.content_id,
+                interaction_type=interaction.interaction_type,
+                value=interaction.value,
+                metadata=interaction.metadata or {}
+            )
+            for interaction in batch.interactions
+        ])
+        db.commit()
+        
+        # Increment the interaction counter for model retraining
+        await increment_interaction_counter(count)
+        
+        return MovieInteractionBatchResponse(count=count)
+    except HTTPException:
+        raise
+    except Exception as e:
+        if db:
+            db.rollback()
+        logger.error("Error creating interactions: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create interactions: {str(e)}"
+        )
+
 @router.get("/genres", response_model=List[str])
 async def get_genres(
     user = Depends(get_current_user)
@@ -235,7 +302,7 @@ async def get_genres(
         
         return sorted(list(all_genres))
     except Exception as e:
-        logger.error(f"Error retrieving genres: {str(e)}")
+        logger.error("Error retrieving genres: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve genres: {str(e)}"
@@ -260,7 +327,7 @@ async def get_years(
         
         return sorted(list(all_years))
     except Exception as e:
-        logger.error(f"Error retrieving years: {str(e)}")
+        logger.error("Error retrieving years: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve years: {str(e)}"
@@ -302,6 +369,7 @@ async def refresh_dataset(
                 ], check=True)
                 
                 # Reload content items
+                invalidate_content_cache()
                 content_items = get_content_items()
                 
                 if content_items:
@@ -318,7 +386,7 @@ async def refresh_dataset(
                         detail="Downloaded dataset but content items are still missing"
                     )
             except subprocess.CalledProcessError as e:
-                logger.error(f"Error running data processor: {str(e)}")
+                logger.error("Error running data processor: %s", e)
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail=f"Failed to download dataset: {str(e)}"
@@ -335,7 +403,7 @@ async def refresh_dataset(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error refreshing dataset: {str(e)}")
+        logger.error("Error refreshing dataset: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to refresh dataset: {str(e)}"
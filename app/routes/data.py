@@ -85,7 +85,7 @@ def get_dataset_status(dataset_name: str = "movielens-small") -> DatasetInfoResp
                 os.path.getmtime(os.path.join(processed_dir, "content_items.json"))
             ).isoformat()
         except Exception as e:
-            logger.error(f"Error getting dataset details: {str(e)}")
+            logger.error("Error getting dataset details: %s", e)
     
     status = "ready" if is_processed else "not_ready"
     if not is_downloaded:
@@ -157,7 +157,7 @@ async def run_data_processor(dataset_name: str, job_id: str):
                 "progress": 1.0,
                 "end_time": datetime.now().isoformat()
             }
-            logger.error(f"Data processing failed: {error_msg}")
+            logger.error("Data processing failed: %s", error_msg)
     except Exception as e:
         active_jobs[job_id] = {
             "status": "failed",
@@ -165,7 +165,7 @@ async def run_data_processor(dataset_name: str, job_id: str):
             "progress": 1.0,
             "end_time": datetime.now().isoformat()
         }
-        logger.error(f"Error in data processing task: {str(e)}")
+        logger.error("Error in data processing task: %s", e)
 
 async def run_model_trainer(dataset_name: str, job_id: str):
     """Run the model trainer script as a background task"""
@@ -223,7 +223,7 @@ async def run_model_trainer(dataset_name: str, job_id: str):
                 
                 # Create new symlink
                 os.symlink(latest_model, latest_link)
-                logger.info(f"Created symlink from {latest_model} to latest")
+                logger.info("Created symlink from %s to latest", latest_model)
             
             active_jobs[job_id] = {
                 "status": "completed",
@@ -239,7 +239,7 @@ async def run_model_trainer(dataset_name: str, job_id: str):
                 "progress": 1.0,
                 "end_time": datetime.now().isoformat()
             }
-            logger.error(f"Model training failed: {error_msg}")
+            logger.error("Model training failed: %s", error_msg)
     except Exception as e:
         active_jobs[job_id] = {
             "status": "failed",
@@ -247,7 +247,7 @@ async def run_model_trainer(dataset_name: str, job_id: str):
             "progress": 1.0,
             "end_time": datetime.now().isoformat()
         }
-        logger.error(f"Error in model training task: {str(e)}")
+        logger.error("Error in model training task: %s", e)
 
 # API routes
 @router.get("/datasets", response_model=List[DatasetInfoResponse])
@@ -266,7 +266,7 @@ async def get_datasets(
         
         return result
     except Exception as e:
-        logger.error(f"Error getting datasets: {str(e)}")
+        logger.error("Error getting datasets: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get datasets: {str(e)}"
@@ -302,7 +302,7 @@ async def download_dataset(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error starting dataset download: {str(e)}")
+        logger.error("Error starting dataset download: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to start download: {str(e)}"
@@ -338,7 +338,7 @@ async def train_model(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error starting model training: {str(e)}")
+        logger.error("Error starting model training: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to start model training: {str(e)}"
@@ -368,7 +368,7 @@ async def get_job_status(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting job status: {str(e)}")
+        logger.error("Error getting job status: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get job status: {str(e)}"
@@ -425,7 +425,7 @@ async def get_models(
         
         return result
     except Exception as e:
-        logger.error(f"Error getting models: {str(e)}")
+        logger.error("Error getting models: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get models: {str(e)}"
@@ -467,7 +467,7 @@ async def activate_model(
         
         # Create new symlink
         os.symlink(model_id, latest_link)
-        logger.info(f"Set model {model_id} as active model")
+        logger.info("Set model %s as active model", model_id)
         
         # Load model info
         with open(info_path, "r") as f:
@@ -491,7 +491,7 @@ async def activate_model(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error activating model: {str(e)}")
+        logger.error("Error activating model: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to activate model: {str(e)}"
@@ -507,7 +507,7 @@ async def get_my_interactions(
     try:
         interactions = db.query(InteractionDB).filter(
             InteractionDB.user_id == user.id
-        ).limit(limit).all()
+        ).order_by(InteractionDB.timestamp.desc()).limit(limit).all()
         
         result = []
         for interaction in interactions:
@@ -523,7 +523,7 @@ async def get_my_interactions(
         
         return result
     except Exception as e:
-        logger.error(f"Error getting user interactions: {str(e)}")
+        logger.error("Error getting user interactions: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get interactions: {str(e)}"
@@ -34,7 +34,7 @@ def get_dataset_info(dataset_name: str) -> Optional[Dict[str, Any]]:
         dataset = mongodb.datasets.find_one({"name": dataset_name})
         return dataset
     except Exception as e:
-        logger.error(f"Error retrieving dataset {dataset_name}: {str(e)}")
+        logger.error("Error retrieving dataset %s: %s", dataset_name, e)
         return None
 
 async def train_model_task(dataset: str, epochs: int, batch_size: int) -> Dict[str, Any]:
@@ -66,7 +66,7 @@ async def train_model_task(dataset: str, epochs: int, batch_size: int) -> Dict[s
             "--batch-size", str(batch_size)
         ]
         
-        logger.info(f"Running training command: {' '.join(cmd)}")
+        logger.info("Running training command: %s", ' '.join(cmd))
         
         # Run the training script
         result = subprocess.run(
@@ -77,7 +77,7 @@ async def train_model_task(dataset: str, epochs: int, batch_size: int) -> Dict[s
         )
         
         if result.returncode != 0:
-            logger.error(f"Training failed: {result.stderr}")
+            logger.error("Training failed: %s", result.stderr)
             raise Exception(f"Model training failed: {result.stderr}")
         
         # Update the latest model symlink
@@ -107,13 +107,13 @@ async def train_model_task(dataset: str, epochs: int, batch_size: int) -> Dict[s
         }
         
     except FileNotFoundError as e:
-        logger.error(f"File not found error: {str(e)}")
+        logger.error("File not found error: %s", e)
         return {"success": False, "error": str(e)}
     except subprocess.CalledProcessError as e:
-        logger.error(f"Process error: {e.stderr}")
+        logger.error("Process error: %s", e.stderr)
         return {"success": False, "error": e.stderr}
     except Exception as e:
-        logger.error(f"Error training model: {str(e)}")
+        logger.error("Error training model: %s", e)
         return {"success": False, "error": str(e)}
 
 @router.post("/train-model", response_model=DatasetResponse)
@@ -182,7 +182,7 @@ async def list_datasets() -> List[DatasetInfo]:
             ))
         return datasets
     except Exception as e:
-        logger.error(f"Error retrieving datasets: {str(e)}")
+        logger.error("Error retrieving datasets: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to retrieve datasets: {str(e)}"
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from fastapi.param_functions import Query
 from fastapi.middleware.cors import CORSMiddleware
-import requests
+import httpx
 from app.core.config import settings
 from redis import asyncio as aioredis
 import logging
@@ -15,11 +15,16 @@ redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
 
 WIKI_API_URL = "https://en.wikipedia.org/w/api.php"
 
+async def get_http(request: Request) -> httpx.AsyncClient:
+    """Shared outbound HTTP client created in the app lifespan"""
+    return request.app.state.http
+
 @router.get("/wikipedia")
 async def get_wikipedia_content(
     search: str = Query(..., min_length=3),
     limit: int = 5,
-    response: Response = None
+    response: Response = None,
+    http: httpx.AsyncClient = Depends(get_http)
 ):
     # Add CORS headers
     response.headers["Access-Control-Allow-Origin"] = "*"
@@ -30,7 +35,7 @@ async def get_wikipedia_content(
         # Check cache first
         cached = await redis_client.get(cache_key)
         if cached:
-            logger.info(f"Returning cached Wikipedia results for '{search}'")
+            logger.info("Returning cached Wikipedia results for '%s'", search)
             return {"source": "wikipedia", "results": json.loads(cached)}
         
         params = {
@@ -42,10 +47,10 @@ async def get_wikipedia_content(
             "srlimit": limit
         }
         
-        response = requests.get(WIKI_API_URL, params=params)
-        response.raise_for_status()
+        wiki_response = await http.get(WIKI_API_URL, params=params)
+        wiki_response.raise_for_status()
         
-        data = response.json()
+        data = wiki_response.json()
         results = [
             {
                 "title": item["title"],
@@ -60,14 +65,14 @@ async def get_wikipedia_content(
         
         return {"source": "wikipedia", "results": results}
     
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Wikipedia API error: {str(e)}")
+    except httpx.HTTPError as e:
+        logger.error("Wikipedia API error: %s", e)
         raise HTTPException(
             status_code=502,
             detail="Wikipedia API is currently unavailable"
         )
     except Exception as e:
-        logger.error(f"Wikipedia processing error: {str(e)}")
+        logger.error("Wikipedia processing error: %s", e)
         raise HTTPException(
             status_code=500,
             detail="Failed to process Wikipedia results"
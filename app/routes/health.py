@@ -7,6 +7,7 @@ import logging
 from ..core.auth import get_current_user
 from ..services.scheduler import get_scheduler
 from ..services.interaction_counter import get_interaction_count
+from ..utils.clock import iso_now
 
 # Try to import psutil, but provide fallback if not available
 try:
@@ -18,6 +19,9 @@ except ImportError:
 
 router = APIRouter(prefix="/health", tags=["health"])
 
+# Resolved once at import; ENV doesn't change while the process runs
+_ENVIRONMENT = "production" if os.getenv("ENV") == "production" else "development"
+
 class HealthResponse(BaseModel):
     status: str
     version: str
@@ -28,8 +32,6 @@ class HealthResponse(BaseModel):
 @router.get("", response_model=HealthResponse)
 async def health_check():
     """Basic health check endpoint"""
-    environment = "production" if os.getenv("ENV") == "production" else "development"
-    
     # Gather basic system resources if psutil is available
     resources = None
     if PSUTIL_AVAILABLE:
@@ -46,8 +48,8 @@ async def health_check():
     return HealthResponse(
         status="healthy",
         version="1.0.0",
-        timestamp=datetime.now().isoformat(),
-        environment=environment,
+        timestamp=iso_now(),
+        environment=_ENVIRONMENT,
         resources=resources
     )
 
@@ -43,5 +43,5 @@ async def track_interaction(
         return {"status": "interaction tracked", "id": str(result.inserted_id)}
         
     except Exception as e:
-        logger.error(f"Error tracking interaction: {str(e)}")
+        logger.error("Error tracking interaction: %s", e)
         raise HTTPException(status_code=500, detail="Failed to track interaction") 
\ No newline at end of file
@@ -4,7 +4,7 @@ import logging
 import json
 import os
 import random
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from ..db.mongodb import get_mongodb
 from ..db.redis import get_redis
 from ..services.dataset_manager import get_movie_by_id, search_movies_by_title
@@ -29,6 +29,9 @@ class RecommendationsResponse(BaseModel):
     user_id: Optional[str] = None
     total: int
 
+# Cached recommendation lists are (de)serialized through one prebuilt adapter
+_MOVIE_LIST_ADAPTER = TypeAdapter(List[MovieRecommendation])
+
 # Constants for model directory
 MODELS_DIR = "models"
 RECOMMENDER_DIR = os.path.join(MODELS_DIR, "recommender")
@@ -53,7 +56,7 @@ async def load_model_metadata():
             with open(MODEL_METADATA_FILE, 'r') as f:
                 return json.load(f)
 except Exception as e:
-        logger.error(f"Error loading model metadata: {str(e)}")
+        logger.error("Error loading model metadata: %s", e)
     
     return None
 
@@ -105,7 +108,7 @@ async def get_popular_movies(limit: int = 10) -> List[MovieRecommendation]:
             cache_key = "popular_movies"
             cached = await redis.get(cache_key)
             if cached:
-                return [MovieRecommendation(**movie) for movie in json.loads(cached)]
+                return _MOVIE_LIST_ADAPTER.validate_json(cached)
         
         # Final fallback - return random movies from search
         random_titles = ["star", "love", "war", "adventure", "world", "house", "life"]
@@ -121,7 +124,7 @@ async def get_popular_movies(limit: int = 10) -> List[MovieRecommendation]:
         ) for movie in random_movies]
         
     except Exception as e:
-        logger.error(f"Error getting popular movies: {str(e)}")
+        logger.error("Error getting popular movies: %s", e)
         # Return empty list if all fails
         return []
 
@@ -162,7 +165,7 @@ async def get_recommendations(
                 if redis:
                     cached = await redis.get(cache_key)
                     if cached:
-                        recommendations = [MovieRecommendation(**movie) for movie in json.loads(cached)]
+                        recommendations = _MOVIE_LIST_ADAPTER.validate_json(cached)
                 
                 # If no cache, load model and generate recommendations
                 if not recommendations:
@@ -184,16 +187,20 @@ async def get_recommendations(
                         # Get already rated movie ids to exclude from recommendations
                         rated_movie_ids = set(interaction["content_id"] for interaction in user_interactions)
                         
-                        # Calculate scores for all items
-                        scores = {}
-                        for movie_id, idx in item_id_map.items():
-                            if movie_id not in rated_movie_ids:  # Skip already rated movies
-                                item_vector = item_factors[idx]
-                                score = np.dot(user_vector, item_vector)
-                                scores[movie_id] = float(score)
+                        # Score unrated items with one matrix-vector product
+                        candidates = [
+                            (movie_id, idx) for movie_id, idx in item_id_map.items()
+                            if movie_id not in rated_movie_ids  # Skip already rated movies
+                        ]
+                        candidate_ids = [movie_id for movie_id, _ in candidates]
+                        scores = item_factors[[idx for _, idx in candidates]] @ user_vector
                         
-                        # Get top N movie_ids by score
-                        top_movie_ids = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:limit * 2]
+                        # Get top N movie_ids by score: O(N) partition, then
+                        # sort only the selected few
+                        k = min(limit * 2, len(candidate_ids))
+                        top = np.argpartition(-scores, k - 1)[:k] if k else np.empty(0, dtype=int)
+                        top = top[np.argsort(-scores[top])]
+                        top_movie_ids = [(candidate_ids[i], float(scores[i])) for i in top]
                         
                         # Get movie details and build recommendations
                         for movie_id, score in top_movie_ids:
@@ -211,12 +218,12 @@ async def get_recommendations(
                         
                         # Cache recommendations
                         if redis and recommendations:
-                            rec_json = json.dumps([rec.dict() for rec in recommendations])
+                            rec_json = _MOVIE_LIST_ADAPTER.dump_json(recommendations)
                             await redis.set(cache_key, rec_json, ex=3600)  # Cache for 1 hour
                     else:
                         recommendation_strategy = "new_user"
             except Exception as e:
-                logger.error(f"Error generating personalized recommendations: {str(e)}")
+                logger.error("Error generating personalized recommendations: %s", e)
                 recommendation_strategy = "model_error"
                 
         # Fallback to popularity-based if:
@@ -238,7 +245,7 @@ async def get_recommendations(
         )
         
     except Exception as e:
-        logger.error(f"Error generating recommendations: {str(e)}")
+        logger.error("Error generating recommendations: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error generating recommendations: {str(e)}"
@@ -39,5 +39,5 @@ async def update_preferences(
         return {"status": "preferences updated"}
         
     except Exception as e:
-        logger.error(f"Error updating preferences: {str(e)}")
+        logger.error("Error updating preferences: %s", e)
         raise HTTPException(status_code=500, detail="Failed to update preferences") 
\ No newline at end of file
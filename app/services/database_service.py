@@ -1,9 +1,10 @@
-from app.repositories.supabase_repository import SupabaseRepository
+from app.repositories.supabase_repository import SupabaseRepository, InteractionBuffer
 from app.models.sql_models import User, Content, UserInteraction
 
 class DatabaseService:
     def __init__(self):
         self.repo = SupabaseRepository()
+        self.interaction_buffer = InteractionBuffer(self.repo)
     
     async def create_user(self, email: str, username: str, preferences: dict = None) -> User:
         user = User(
@@ -26,4 +27,24 @@ class DatabaseService:
             interaction_type=interaction_type,
             rating=rating
         )
-        return await self.repo.store_interaction(interaction) 
\ No newline at end of file
+        return await self.repo.store_interaction(interaction)
+    
+    async def close(self):
+        """Write any queued interactions; InsertBuffer registers this buffer
+        for close_all_buffers() at shutdown too"""
+        await self.interaction_buffer.close()
+    
+    def queue_interaction(
+        self,
+        user_id: int,
+        content_id: int,
+        interaction_type: str,
+        rating: float = None
+    ):
+        """Record an interaction in the next bulk insert (fire-and-forget)"""
+        self.interaction_buffer.add(UserInteraction(
+            user_id=user_id,
+            content_id=content_id,
+            interaction_type=interaction_type,
+            rating=rating
+        ))
@@ -1,4 +1,3 @@
-import uuid
 import random
 from datetime import datetime
 from typing import Dict, List, Optional
@@ -11,6 +10,8 @@ from app.models.experiment import (
     ExperimentEvent
 )
 from app.db.database import mongodb
+from app.db.insert_buffer import InsertBuffer
+from app.utils.ids import uuid7
 from app.core.monitoring import metrics_logger, logger
 
 class ExperimentService:
@@ -18,11 +19,35 @@ class ExperimentService:
         self.experiments_collection = mongodb.experiments
         self.assignments_collection = mongodb.user_assignments
         self.events_collection = mongodb.experiment_events
+        # Impressions arrive far faster than they need to be persisted one by one
+        self.event_buffer = InsertBuffer(self.events_collection)
         self.cache: Dict[str, Experiment] = {}
+        self._indexes_ready = False
+
+    async def ensure_indexes(self):
+        """Create the indexes behind the per-request lookups (idempotent).
+
+        Variants and metrics are embedded in the experiment document, so an
+        experiment loads in one query; what needs indexing are the lookups
+        by experiment id and by (user, experiment) assignment.
+        """
+        if self._indexes_ready:
+            return
+        await self.experiments_collection.create_index("id", unique=True)
+        await self.experiments_collection.create_index("status")
+        await self.assignments_collection.create_index(
+            [("user_id", 1), ("experiment_id", 1)],
+            unique=True
+        )
+        await self.events_collection.create_index(
+            [("experiment_id", 1), ("variant_id", 1), ("timestamp", -1)]
+        )
+        self._indexes_ready = True
 
     async def create_experiment(self, experiment: Experiment) -> Experiment:
         """Create a new experiment."""
-        experiment.id = str(uuid.uuid4())
+        await self.ensure_indexes()
+        experiment.id = str(uuid7())  # appends to the unique id index
         await self.experiments_collection.insert_one(experiment.dict())
         return experiment
 
@@ -60,6 +85,8 @@ class ExperimentService:
         experiment_id: str
     ) -> Optional[str]:
         """Assign user to an experiment variant."""
+        await self.ensure_indexes()
+        
         # Check if user is already assigned
         assignment = await self.assignments_collection.find_one({
             "user_id": user_id,
@@ -96,8 +123,8 @@ class ExperimentService:
     async def record_event(self, event: ExperimentEvent):
         """Record an experiment event."""
         try:
-            # Store event
-            await self.events_collection.insert_one(event.dict())
+            # Queue event for the next batched write
+            self.event_buffer.add(event.dict())
             
             # Update metrics
             experiment = await self.get_experiment(event.experiment_id)
@@ -120,6 +147,7 @@ class ExperimentService:
                 metrics.conversions += 1
                 if "revenue" in event.metadata:
                     metrics.total_revenue += float(event.metadata["revenue"])
+            metrics.update_rates()
             
             # Update experiment
             await self.update_experiment(experiment)
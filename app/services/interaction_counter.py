@@ -8,11 +8,14 @@ from ..db.redis import get_redis
 
 logger = logging.getLogger(__name__)
 
-async def increment_interaction_counter() -> bool:
+async def increment_interaction_counter(count: int = 1) -> bool:
     """
     Increment the counter for new interactions since last model retraining.
     This should be called every time a user interacts with content.
     
+    Args:
+        count: Number of interactions recorded
+        
     Returns:
         bool: True if successful, False otherwise
     """
@@ -22,15 +25,15 @@ async def increment_interaction_counter() -> bool:
             # Get current count (default to 0 if not exists)
             current_count = await redis.get("new_interactions_count")
             if current_count is None:
-                await redis.set("new_interactions_count", 1)
+                await redis.set("new_interactions_count", count)
             else:
-                await redis.incr("new_interactions_count")
+                await redis.incrby("new_interactions_count", count)
             return True
         else:
             logger.warning("Redis not available. Interaction count not incremented.")
             return False
     except Exception as e:
-        logger.error(f"Error incrementing interaction counter: {str(e)}")
+        logger.error("Error incrementing interaction counter: %s", e)
         return False
 
 async def get_interaction_count() -> Optional[int]:
@@ -49,7 +52,7 @@ async def get_interaction_count() -> Optional[int]:
             logger.warning("Redis not available. Cannot get interaction count.")
             return None
     except Exception as e:
-        logger.error(f"Error getting interaction count: {str(e)}")
+        logger.error("Error getting interaction count: %s", e)
         return None
 
 async def reset_interaction_counter() -> bool:
@@ -69,6 +72,6 @@ async def reset_interaction_counter() -> bool:
             logger.warning("Redis not available. Interaction count not reset.")
             return False
     except Exception as e:
-        logger.error(f"Error resetting interaction counter: {str(e)}")
+        logger.error("Error resetting interaction counter: %s", e)
         return False
 
@@ -1,10 +1,11 @@
-from typing import List, Optional, Set
+from typing import FrozenSet, List, Optional
 from app.models.rbac import (
     Permission,
     Role,
     RoleDefinition,
     UserRole,
-    ROLE_DEFINITIONS
+    ROLE_DEFINITIONS,
+    RESOLVED_PERMISSIONS
 )
 from app.models.user import User
 from app.db.database import mongodb
@@ -83,23 +84,11 @@ class RBACService:
             )
             return Role.BASIC_USER
 
-    async def get_user_permissions(self, user_id: str) -> Set[Permission]:
-        """Get all permissions for a user based on their role."""
+    async def get_user_permissions(self, user_id: str) -> FrozenSet[Permission]:
+        """Get all permissions for a user based on their role (parents included)."""
         try:
             role = await self.get_user_role(user_id)
-            if role not in ROLE_DEFINITIONS:
-                return set()
-            
-            permissions = ROLE_DEFINITIONS[role].permissions
-            
-            # Add permissions from parent roles
-            current_role = ROLE_DEFINITIONS[role]
-            while current_role.parent_role:
-                parent_role = ROLE_DEFINITIONS[current_role.parent_role]
-                permissions.update(parent_role.permissions)
-                current_role = parent_role
-            
-            return permissions
+            return RESOLVED_PERMISSIONS.get(role, frozenset())
             
         except Exception as e:
             metrics_logger.log_error(
@@ -107,7 +96,7 @@ class RBACService:
                 str(e),
                 {"user_id": user_id}
             )
-            return set()
+            return frozenset()
 
     async def check_permission(
         self,
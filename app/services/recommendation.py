@@ -2,7 +2,7 @@ import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
 from typing import List, Dict, Optional
 from sqlalchemy.orm import Session
-from ..models.content import Content
+from ..models.content import Content, Vector
 from ..models.interaction import Interaction
 import tensorflow as tf
 import pandas as pd
@@ -62,7 +62,7 @@ class RecommendationEngine:
 
             logger.info("Collaborative filtering model trained successfully")
         except Exception as e:
-            logger.error(f"Error training collaborative filtering model: {str(e)}")
+            logger.error("Error training collaborative filtering model: %s", e)
             raise
 
     async def get_content_based_recommendations(
@@ -87,6 +87,30 @@ class RecommendationEngine:
                 Content.id.in_(interacted_content_ids)
             ).all()
 
+            user_profile = np.mean([
+                self._get_content_embedding(c) for c in interacted_content
+            ], axis=0)
+
+            if Vector is not None:
+                # Let the HNSW index pick the nearest items instead of scoring
+                # the whole catalog in Python
+                distance = Content.embedding.cosine_distance(user_profile).label("distance")
+                query = self.db.query(Content, distance).filter(
+                    Content.embedding.isnot(None),
+                    Content.id.notin_(interacted_content_ids)
+                )
+                if content_type:
+                    query = query.filter(Content.content_type == content_type)
+                return [
+                    {
+                        "content_id": content.id,
+                        "title": content.title,
+                        "type": content.content_type,
+                        "score": 1.0 - float(dist)
+                    }
+                    for content, dist in query.order_by(distance).limit(limit).all()
+                ]
+
             # Calculate content similarity
             all_content = self.db.query(Content)
             if content_type:
@@ -97,10 +121,6 @@ class RecommendationEngine:
             content_vectors = np.array([
                 self._get_content_embedding(c) for c in all_content
             ])
-            
-            user_profile = np.mean([
-                self._get_content_embedding(c) for c in interacted_content
-            ], axis=0)
 
             # Calculate similarity scores
             similarities = cosine_similarity([user_profile], content_vectors)[0]
@@ -124,7 +144,7 @@ class RecommendationEngine:
             return recommendations
 
         except Exception as e:
-            logger.error(f"Error getting content-based recommendations: {str(e)}")
+            logger.error("Error getting content-based recommendations: %s", e)
             raise
 
     async def get_collaborative_recommendations(
@@ -179,11 +199,13 @@ class RecommendationEngine:
             return recommendations
 
         except Exception as e:
-            logger.error(f"Error getting collaborative recommendations: {str(e)}")
+            logger.error("Error getting collaborative recommendations: %s", e)
             raise
 
     def _get_content_embedding(self, content: Content) -> np.ndarray:
         """Get or compute content embedding"""
+        if content.embedding is not None and Vector is not None:
+            return np.asarray(content.embedding, dtype=np.float32)
         if content.id not in self.content_embeddings:
             # Here you would implement your embedding logic
             # This could use pre-trained models like BERT for text
@@ -205,11 +227,11 @@ async def get_recommendations(user_id: str):
             return response.json()["recommendations"]
             
     except httpx.HTTPStatusError as e:
-        logger.error(f"Recommendation service error: {e.response.text}")
+        logger.error("Recommendation service error: %s", e.response.text)
         if e.response.status_code == status.HTTP_404_NOT_FOUND:
             return get_fallback_recommendations()
     except Exception as e:
-        logger.error(f"Recommendation service unavailable: {str(e)}")
+        logger.error("Recommendation service unavailable: %s", e)
         return get_fallback_recommendations()
 
 def get_fallback_recommendations():
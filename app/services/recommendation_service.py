@@ -5,7 +5,7 @@ from app.models.neural_recommender import NeuralRecommender
 from app.db.database import user_profiles, content_items, user_interactions, redis_client
 from app.core.config import settings
 from app.training.task_manager import task_manager
-import json
+import orjson
 import tensorflow as tf
 
 class RecommendationService:
@@ -24,7 +24,7 @@ class RecommendationService:
         cached = redis_client.get(cache_key)
         
         if cached:
-            return [Recommendation(**json.loads(r)) for r in json.loads(cached)]
+            return [Recommendation(**r) for r in orjson.loads(cached)]
         
         try:
             # Get user's interaction history
@@ -71,7 +71,7 @@ class RecommendationService:
                 redis_client.setex(
                     cache_key,
                     300,  # Cache for 5 minutes
-                    json.dumps([r.dict() for r in recommendations])
+                    orjson.dumps([r.model_dump() for r in recommendations])
                 )
             
             return recommendations
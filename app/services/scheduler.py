@@ -6,19 +6,50 @@ This module handles scheduled tasks like model retraining based on user interact
 import asyncio
 import logging
 import os
-import subprocess
 from datetime import datetime, timedelta
 from pathlib import Path
 import time
-import threading
 from typing import Dict, Any, Optional
 
+import orjson
+
 from ..core.config import settings
 from ..db.mongodb import mongodb
 from ..db.redis import get_redis
+from .interaction_counter import reset_interaction_counter
 
 logger = logging.getLogger(__name__)
 
+# Manual retraining job state lives in Redis so any worker can report it
+RETRAIN_JOB_PREFIX = "retrain:"
+RETRAIN_JOB_TTL = 7 * 24 * 3600
+
+# Seconds the training process gets to exit after SIGTERM before SIGKILL
+PROCESS_STOP_TIMEOUT = 10
+
+async def stop_process(process: asyncio.subprocess.Process):
+    """Terminate a child process and reap it, killing it if it won't exit."""
+    if process.returncode is not None:
+        return
+    try:
+        process.terminate()
+        await asyncio.wait_for(process.wait(), PROCESS_STOP_TIMEOUT)
+    except ProcessLookupError:
+        # Exited between the check and the signal
+        await process.wait()
+    except asyncio.TimeoutError:
+        logger.warning("Training process %s ignored SIGTERM; killing it", process.pid)
+        process.kill()
+        await process.wait()
+
+async def get_retraining_job(job_id: str) -> Dict[str, Any]:
+    """Stored state of a manual retraining job, or {} if unknown or expired."""
+    redis = await get_redis()
+    state = await redis.hgetall(f"{RETRAIN_JOB_PREFIX}{job_id}")
+    if "result" in state:
+        state["result"] = orjson.loads(state["result"])
+    return state
+
 class ModelRetrainingScheduler:
     """Scheduler for periodic model retraining based on user interactions."""
     
@@ -47,8 +78,11 @@ class ModelRetrainingScheduler:
         self.batch_size = batch_size
         self.running = False
         self.last_retraining_time = None
-        self.thread = None
-        self.lock = threading.Lock()
+        self.task: Optional[asyncio.Task] = None
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.is_retraining = False
+        # Running manual retraining jobs by id, so stop() can cancel them
+        self.jobs: Dict[str, asyncio.Task] = {}
     
     async def should_retrain(self) -> bool:
         """
@@ -69,7 +103,7 @@ class ModelRetrainingScheduler:
         else:
             time_since_last_retraining = datetime.now() - self.last_retraining_time
             if time_since_last_retraining < timedelta(hours=self.retraining_interval_hours):
-                logger.info(f"Not enough time elapsed since last retraining ({time_since_last_retraining})")
+                logger.info("Not enough time elapsed since last retraining (%s)", time_since_last_retraining)
                 return False
         
         # Check new interaction count since last retraining
@@ -80,12 +114,12 @@ class ModelRetrainingScheduler:
                 new_interactions_count = await redis.get("new_interactions_count")
                 if new_interactions_count:
                     new_interactions_count = int(new_interactions_count)
-                    logger.info(f"Found {new_interactions_count} new interactions since last retraining")
+                    logger.info("Found %s new interactions since last retraining", new_interactions_count)
                     if new_interactions_count >= self.interaction_threshold:
-                        logger.info(f"Interaction threshold reached ({new_interactions_count} >= {self.interaction_threshold})")
+                        logger.info("Interaction threshold reached (%s >= %s)", new_interactions_count, self.interaction_threshold)
                         return True
                     else:
-                        logger.info(f"Interaction threshold not reached ({new_interactions_count} < {self.interaction_threshold})")
+                        logger.info("Interaction threshold not reached (%s < %s)", new_interactions_count, self.interaction_threshold)
                 else:
                     # Initialize counter if it doesn't exist
                     await redis.set("new_interactions_count", 0)
@@ -100,13 +134,13 @@ class ModelRetrainingScheduler:
                     
                     # Count interactions since that time
                     new_count = await mongodb.interactions.count_documents({"timestamp": {"$gt": last_time}})
-                    logger.info(f"Found {new_count} new interactions in MongoDB since last retraining")
+                    logger.info("Found %s new interactions in MongoDB since last retraining", new_count)
                     return new_count >= self.interaction_threshold
                 else:
                     logger.warning("Neither Redis nor MongoDB available. Defaulting to time-based retraining.")
                     return True
         except Exception as e:
-            logger.error(f"Error checking interaction count: {str(e)}")
+            logger.error("Error checking interaction count: %s", e)
             # Default to True if there's an error checking conditions
             return True
         
@@ -145,19 +179,27 @@ class ModelRetrainingScheduler:
                 "--batch-size", str(self.batch_size)
             ]
             
-            logger.info(f"Running retraining command: {' '.join(cmd)}")
+            logger.info("Running retraining command: %s", ' '.join(cmd))
             
-            # Run the training script as a subprocess
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
+            # Run the training script as a child process; the handle is kept
+            # so stop() can terminate it
+            self.process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
             )
+            try:
+                _, stderr = await self.process.communicate()
+            finally:
+                # On cancellation the child would otherwise outlive us
+                await stop_process(self.process)
+                returncode = self.process.returncode
+                self.process = None
             
-            if result.returncode != 0:
-                logger.error(f"Retraining failed: {result.stderr}")
-                raise Exception(f"Model retraining failed: {result.stderr}")
+            if returncode != 0:
+                stderr = stderr.decode(errors="replace")
+                logger.error("Retraining failed: %s", stderr)
+                raise Exception(f"Model retraining failed: {stderr}")
             
             # Update the latest model symlink
             latest_symlink = models_dir / "latest"
@@ -180,7 +222,7 @@ class ModelRetrainingScheduler:
                 if redis:
                     await redis.set("new_interactions_count", 0)
             except Exception as e:
-                logger.error(f"Error resetting interaction counter: {str(e)}")
+                logger.error("Error resetting interaction counter: %s", e)
             
             # Store training result in MongoDB
             try:
@@ -206,7 +248,7 @@ class ModelRetrainingScheduler:
                         }
                     })
             except Exception as e:
-                logger.error(f"Error storing model info in MongoDB: {str(e)}")
+                logger.error("Error storing model info in MongoDB: %s", e)
             
             return {
                 "success": True,
@@ -215,27 +257,87 @@ class ModelRetrainingScheduler:
             }
             
         except Exception as e:
-            logger.error(f"Error retraining model: {str(e)}")
+            logger.error("Error retraining model: %s", e)
             return {
                 "success": False,
                 "error": str(e)
             }
     
+    def submit_retraining(self, job_id: str) -> bool:
+        """
+        Start a one-off retraining job on the event loop.
+        
+        The in-progress flag is set before the task is created, so concurrent
+        requests cannot both start a job.
+        
+        Returns:
+            bool: False if another retraining job is already running
+        """
+        if self.is_retraining:
+            return False
+        self.is_retraining = True
+        self.jobs[job_id] = asyncio.get_running_loop().create_task(self._run_retraining_job(job_id))
+        return True
+    
+    async def _record_job(self, job_id: str, **fields):
+        try:
+            redis = await get_redis()
+            key = f"{RETRAIN_JOB_PREFIX}{job_id}"
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.hset(key, mapping=fields)
+                pipe.expire(key, RETRAIN_JOB_TTL)
+                await pipe.execute()
+        except Exception as e:
+            logger.error("Error recording retraining job %s: %s", job_id, e)
+    
+    async def _run_retraining_job(self, job_id: str) -> Dict[str, Any]:
+        await self._record_job(job_id, status="running", started_at=datetime.now().isoformat())
+        try:
+            result = await self.retrain_model()
+            
+            # Reset the interaction counter regardless of success
+            await reset_interaction_counter()
+            
+            logger.info("Manual retraining %s completed: %s", job_id, result)
+        except asyncio.CancelledError:
+            # Not an Exception, so record it here or the job reads "running"
+            # until the key expires
+            await self._record_job(job_id, status="cancelled", completed_at=datetime.now().isoformat())
+            raise
+        except Exception as e:
+            logger.error("Error during manual retraining %s: %s", job_id, e)
+            result = {"success": False, "error": str(e)}
+        finally:
+            self.is_retraining = False
+            self.jobs.pop(job_id, None)
+        
+        await self._record_job(
+            job_id,
+            status="completed" if result.get("success") else "failed",
+            completed_at=datetime.now().isoformat(),
+            result=orjson.dumps(result)
+        )
+        return result
+    
     async def _run_scheduler(self):
         """Main scheduler loop that periodically checks for retraining conditions."""
-        logger.info(f"Starting model retraining scheduler (interval: {self.retraining_interval_hours} hours)")
+        logger.info("Starting model retraining scheduler (interval: %s hours)", self.retraining_interval_hours)
         
         while self.running:
             try:
-                # Check if we should retrain
-                if await self.should_retrain():
+                # Check if we should retrain; skip while a manual job is running
+                if not self.is_retraining and await self.should_retrain():
                     logger.info("Starting model retraining...")
-                    result = await self.retrain_model()
+                    self.is_retraining = True
+                    try:
+                        result = await self.retrain_model()
+                    finally:
+                        self.is_retraining = False
                     
                     if result["success"]:
-                        logger.info(f"Model retraining completed successfully: {result['model_path']}")
+                        logger.info("Model retraining completed successfully: %s", result['model_path'])
                     else:
-                        logger.error(f"Model retraining failed: {result.get('error', 'Unknown error')}")
+                        logger.error("Model retraining failed: %s", result.get('error', 'Unknown error'))
                 
                 # Sleep for an hour before checking again
                 # This is more frequent than the retraining interval to be responsive
@@ -246,39 +348,29 @@ class ModelRetrainingScheduler:
                     await asyncio.sleep(60)  # 1 minute
                     
             except Exception as e:
-                logger.error(f"Error in scheduler loop: {str(e)}")
+                logger.error("Error in scheduler loop: %s", e)
                 await asyncio.sleep(300)  # 5 minutes before retry on error
     
     def start(self):
-        """Start the scheduler in a background thread."""
-        with self.lock:
-            if not self.running:
-                self.running = True
-                
-                # Create event loop for the thread
-                async def _start_scheduler():
-                    await self._run_scheduler()
-                
-                # Start in a separate thread
-                def _thread_target():
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    loop.run_until_complete(_start_scheduler())
-                
-                self.thread = threading.Thread(target=_thread_target)
-                self.thread.daemon = True
-                self.thread.start()
-                logger.info("Model retraining scheduler started")
+        """Start the scheduler as a task on the running event loop."""
+        if not self.running:
+            self.running = True
+            self.task = asyncio.get_running_loop().create_task(self._run_scheduler())
+            logger.info("Model retraining scheduler started")
     
-    def stop(self):
-        """Stop the scheduler."""
-        with self.lock:
-            if self.running:
-                self.running = False
-                if self.thread:
-                    self.thread.join(timeout=5)
-                    self.thread = None
-                logger.info("Model retraining scheduler stopped")
+    async def stop(self):
+        """Stop the scheduler and any retraining in progress."""
+        self.running = False
+        tasks = [task for task in (self.task, *self.jobs.values()) if task is not None]
+        for task in tasks:
+            task.cancel()
+        self.task = None
+        # Cancelled retraining terminates and reaps its training process
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.jobs.clear()
+        if self.process is not None:
+            await stop_process(self.process)
+        logger.info("Model retraining scheduler stopped")
 
 # Singleton instance
 scheduler: Optional[ModelRetrainingScheduler] = None
@@ -0,0 +1,101 @@
+import bcrypt
+import pytest
+from datetime import timedelta
+from types import SimpleNamespace
+from jose import jwt
+from app.core.auth import create_access_token, get_password_hash, password_needs_rehash, verify_password
+from app.core.config import settings
+from app.routes import auth as auth_routes
+
+def test_access_token_round_trips_through_jose():
+    token = create_access_token({"sub": "user@example.com"}, expires_delta=timedelta(minutes=5))
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    assert payload["sub"] == "user@example.com"
+    assert jwt.get_unverified_header(token) == {"alg": settings.ALGORITHM, "typ": "JWT"}
+
+def test_access_token_rejects_other_key():
+    token = create_access_token({"sub": "user@example.com"})
+    with pytest.raises(jwt.JWTError):
+        jwt.decode(token, settings.SECRET_KEY + "x", algorithms=[settings.ALGORITHM])
+
+def test_expired_access_token_is_rejected():
+    token = create_access_token({"sub": "user@example.com"}, expires_delta=timedelta(seconds=-10))
+    with pytest.raises(jwt.ExpiredSignatureError):
+        jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+def test_bcrypt_hash_verifies_and_needs_rehash():
+    legacy = bcrypt.hashpw(b"secret", bcrypt.gensalt(rounds=4)).decode()
+    assert verify_password("secret", legacy)
+    assert not verify_password("wrong", legacy)
+    assert password_needs_rehash(legacy)
+    assert not password_needs_rehash(get_password_hash("secret"))
+
+class FakeSession:
+    def __init__(self):
+        self.statements = []
+        self.committed = False
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        pass
+
+@pytest.mark.asyncio
+async def test_login_rehashes_legacy_password(monkeypatch):
+    user = SimpleNamespace(
+        id="u1",
+        email="user@example.com",
+        username="user",
+        hashed_password=bcrypt.hashpw(b"secret", bcrypt.gensalt(rounds=4)).decode(),
+        is_active=True
+    )
+    invalidated = []
+
+    async def get_login_user(db, identifier):
+        return user
+
+    async def invalidate_login_user(*identifiers):
+        invalidated.extend(identifiers)
+
+    monkeypatch.setattr(auth_routes, "get_login_user", get_login_user)
+    monkeypatch.setattr(auth_routes, "invalidate_login_user", invalidate_login_user)
+    db = FakeSession()
+
+    response = await auth_routes.login_for_access_token(
+        form_data=SimpleNamespace(username="user", password="secret"),
+        db=db
+    )
+
+    assert response["token_type"] == "bearer"
+    assert db.committed
+    new_hash = db.statements[0].compile().params["hashed_password"]
+    assert new_hash.startswith("$argon2")
+    assert verify_password("secret", new_hash)
+    assert invalidated == ["user@example.com", "user"]
+
+@pytest.mark.asyncio
+async def test_login_keeps_current_hash(monkeypatch):
+    user = SimpleNamespace(
+        id="u1",
+        email="user@example.com",
+        username="user",
+        hashed_password=get_password_hash("secret"),
+        is_active=True
+    )
+
+    async def get_login_user(db, identifier):
+        return user
+
+    monkeypatch.setattr(auth_routes, "get_login_user", get_login_user)
+    db = FakeSession()
+
+    await auth_routes.login_for_access_token(
+        form_data=SimpleNamespace(username="user", password="secret"),
+        db=db
+    )
+
+    assert db.statements == []
@@ -0,0 +1,19 @@
+import time
+import uuid
+from app.utils.ids import uuid7
+
+def test_uuid7_version_and_variant():
+    value = uuid7()
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+
+def test_uuid7_leads_with_unix_milliseconds():
+    before = time.time_ns() // 1_000_000
+    value = uuid7()
+    after = time.time_ns() // 1_000_000
+    assert before <= value.int >> 80 <= after
+
+def test_uuid7_orders_by_creation_time():
+    first = uuid7()
+    time.sleep(0.002)
+    assert str(first) < str(uuid7())
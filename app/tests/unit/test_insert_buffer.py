@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+from app.db import insert_buffer
+from app.db.insert_buffer import InsertBuffer, close_all_buffers
+
+class FakeCollection:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batches = []
+
+    async def insert_many(self, documents, ordered=True):
+        if self.fail:
+            raise RuntimeError("write failed")
+        assert ordered is False
+        self.batches.append(list(documents))
+
+@pytest.mark.asyncio
+async def test_flusher_batches_queued_documents():
+    collection = FakeCollection()
+    buffer = InsertBuffer(collection, flush_interval=0.01)
+    for i in range(5):
+        buffer.add({"n": i})
+    await asyncio.sleep(0.05)
+    assert collection.batches == [[{"n": i} for i in range(5)]]
+    await buffer.close()
+
+@pytest.mark.asyncio
+async def test_full_batch_is_split_at_max_batch():
+    collection = FakeCollection()
+    buffer = InsertBuffer(collection, max_batch=2, flush_interval=0.01)
+    for i in range(5):
+        buffer.add({"n": i})
+    await buffer.close()
+    assert [len(batch) for batch in collection.batches] == [2, 2, 1]
+
+@pytest.mark.asyncio
+async def test_close_writes_the_in_flight_batch():
+    collection = FakeCollection()
+    # The flusher is still sleeping on its first document when close() runs
+    buffer = InsertBuffer(collection, flush_interval=0.05)
+    for i in range(3):
+        buffer.add({"n": i})
+    await asyncio.sleep(0)
+    await asyncio.wait_for(buffer.close(), timeout=1)
+    assert sum(collection.batches, []) == [{"n": i} for i in range(3)]
+
+@pytest.mark.asyncio
+async def test_failed_write_is_counted():
+    buffer = InsertBuffer(FakeCollection(fail=True), flush_interval=0.01)
+    buffer.add({"n": 1})
+    buffer.add({"n": 2})
+    await buffer.close()
+    assert buffer.dropped == 2
+
+@pytest.mark.asyncio
+async def test_close_all_buffers_drains_every_buffer():
+    collections = [FakeCollection(), FakeCollection()]
+    for collection in collections:
+        InsertBuffer(collection, flush_interval=0.05).add({"n": 1})
+    await asyncio.sleep(0)
+    await asyncio.wait_for(close_all_buffers(), timeout=1)
+    assert all(collection.batches == [[{"n": 1}]] for collection in collections)
+    insert_buffer._buffers.clear()
@@ -0,0 +1,24 @@
+import pytest
+from app.middleware import rate_limit
+from app.middleware.rate_limit import is_rate_limited
+
+@pytest.fixture(autouse=True)
+def clear_request_store():
+    rate_limit.request_store.clear()
+    yield
+    rate_limit.request_store.clear()
+
+def test_is_rate_limited_window_resets(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limit, "monotonic", lambda: clock[0])
+    assert [is_rate_limited("ip", limit=2, window=60) for _ in range(3)] == [False, False, True]
+    clock[0] += 61
+    assert is_rate_limited("ip", limit=2, window=60) is False
+
+def test_is_rate_limited_evicts_least_recent(monkeypatch):
+    monkeypatch.setattr(rate_limit, "MAX_TRACKED_CLIENTS", 2)
+    is_rate_limited("a")
+    is_rate_limited("b")
+    is_rate_limited("a")
+    is_rate_limited("c")
+    assert list(rate_limit.request_store) == ["a", "c"]
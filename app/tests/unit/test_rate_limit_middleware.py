@@ -0,0 +1,114 @@
+import os
+import pytest
+from types import SimpleNamespace
+from app.middleware import rate_limit
+from app.middleware.rate_limit import RateLimitMiddleware, get_client_ip, limit_requests
+
+class FakeScriptRedis:
+    """Evaluates the sliding-window script against in-memory sorted sets.
+
+    Each key maps member -> score, so re-adding an existing member replaces
+    its entry exactly as ZADD does.
+    """
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.zsets = {}
+
+    def register_script(self, source):
+        async def script(keys, args):
+            if self.fail:
+                raise ConnectionError("redis down")
+            now, window, limit, member = args
+            zset = self.zsets.setdefault(keys[0], {})
+            for expired in [m for m, score in zset.items() if score <= now - window]:
+                del zset[expired]
+            if len(zset) >= limit:
+                return 0
+            zset[member] = now
+            return 1
+        return script
+
+@limit_requests("2/minute")
+async def limited_endpoint():
+    pass
+
+async def open_endpoint():
+    pass
+
+ROUTES = [
+    SimpleNamespace(path="/limited", endpoint=limited_endpoint),
+    SimpleNamespace(path="/open", endpoint=open_endpoint),
+]
+
+def make_middleware(redis, trusted_proxies=0):
+    async def downstream(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+    return RateLimitMiddleware(downstream, redis=redis, trusted_proxies=trusted_proxies)
+
+def make_scope(path, peer="10.0.0.1", forwarded=None):
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return {
+        "type": "http",
+        "path": path,
+        "headers": headers,
+        "client": (peer, 1234),
+        "app": SimpleNamespace(routes=ROUTES),
+    }
+
+async def call(middleware, path, **scope_args):
+    messages = []
+    async def send(message):
+        messages.append(message)
+    await middleware(make_scope(path, **scope_args), None, send)
+    return messages[0]["status"]
+
+@pytest.fixture(autouse=True)
+def clear_request_store():
+    rate_limit.request_store.clear()
+    yield
+    rate_limit.request_store.clear()
+
+@pytest.mark.asyncio
+async def test_redis_window_allows_then_denies():
+    middleware = make_middleware(FakeScriptRedis())
+    assert [await call(middleware, "/limited") for _ in range(3)] == [200, 200, 429]
+    # Each client has its own window
+    assert await call(middleware, "/limited", peer="10.0.0.2") == 200
+
+@pytest.mark.asyncio
+async def test_replicas_with_the_same_pid_share_one_limit(monkeypatch):
+    # Containers commonly all run the app as PID 1
+    monkeypatch.setattr(os, "getpid", lambda: 1)
+    redis = FakeScriptRedis()
+    replicas = [make_middleware(redis), make_middleware(redis)]
+    statuses = [await call(replicas[i % 2], "/limited") for i in range(3)]
+    assert statuses == [200, 200, 429]
+
+@pytest.mark.asyncio
+async def test_untagged_route_is_not_limited():
+    middleware = make_middleware(FakeScriptRedis())
+    assert [await call(middleware, "/open") for _ in range(5)] == [200] * 5
+
+@pytest.mark.asyncio
+async def test_redis_error_falls_back_to_memory():
+    middleware = make_middleware(FakeScriptRedis(fail=True))
+    assert [await call(middleware, "/limited") for _ in range(3)] == [200, 200, 429]
+    assert "ratelimit:/limited:10.0.0.1" in rate_limit.request_store
+
+@pytest.mark.asyncio
+async def test_spoofed_forwarded_for_does_not_reset_the_limit():
+    middleware = make_middleware(FakeScriptRedis())
+    statuses = [await call(middleware, "/limited", forwarded=f"203.0.113.{i}") for i in range(3)]
+    assert statuses == [200, 200, 429]
+
+def test_client_ip_ignores_forwarded_for_without_trusted_proxies():
+    assert get_client_ip(make_scope("/", forwarded="203.0.113.9")) == "10.0.0.1"
+
+def test_client_ip_takes_the_hop_our_proxy_appended():
+    scope = make_scope("/", forwarded="203.0.113.9, 198.51.100.7")
+    assert get_client_ip(scope, trusted_proxies=1) == "198.51.100.7"
+    assert get_client_ip(scope, trusted_proxies=2) == "203.0.113.9"
+    # Fewer hops than trusted proxies: fall back to the socket peer
+    assert get_client_ip(scope, trusted_proxies=3) == "10.0.0.1"
@@ -0,0 +1,47 @@
+import asyncio
+import signal
+import sys
+import pytest
+from app.services import scheduler as scheduler_module
+from app.services.scheduler import ModelRetrainingScheduler, stop_process
+
+@pytest.mark.asyncio
+async def test_cancelled_job_is_recorded_as_cancelled(monkeypatch):
+    scheduler = ModelRetrainingScheduler()
+    records = []
+
+    async def record_job(job_id, **fields):
+        records.append(fields)
+
+    async def retrain_model():
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(scheduler, "_record_job", record_job)
+    monkeypatch.setattr(scheduler, "retrain_model", retrain_model)
+
+    assert scheduler.submit_retraining("job1")
+    await asyncio.sleep(0)
+    await scheduler.stop()
+
+    assert [r["status"] for r in records] == ["running", "cancelled"]
+    assert not scheduler.is_retraining
+    assert scheduler.jobs == {}
+
+@pytest.mark.asyncio
+async def test_stop_process_reaps_the_child():
+    process = await asyncio.create_subprocess_exec(sys.executable, "-c", "import time; time.sleep(60)")
+    await stop_process(process)
+    assert process.returncode == -signal.SIGTERM
+
+@pytest.mark.asyncio
+async def test_stop_process_kills_a_child_ignoring_sigterm(monkeypatch):
+    monkeypatch.setattr(scheduler_module, "PROCESS_STOP_TIMEOUT", 0.5)
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-c",
+        "import signal, sys, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); "
+        "print('ready', flush=True); time.sleep(60)",
+        stdout=asyncio.subprocess.PIPE
+    )
+    await process.stdout.readline()
+    await stop_process(process)
+    assert process.returncode == -signal.SIGKILL
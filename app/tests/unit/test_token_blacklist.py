@@ -0,0 +1,130 @@
+import time
+import pytest
+from app.core.token_blacklist import (
+    BLACKLIST_KEY, TokenBlacklistFilter, is_token_revoked, migrate_legacy_keys, revoke_token, token_digest
+)
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return queue
+
+    async def execute(self):
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+class FakeRedis:
+    """Sorted sets plus plain keys with a TTL, as the blacklist uses them"""
+
+    def __init__(self):
+        self.zsets = {}
+        self.keys = {}
+        self.scans = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def zadd(self, name, mapping, nx=False, gt=False):
+        zset = self.zsets.setdefault(name, {})
+        for member, score in mapping.items():
+            if member in zset and (nx or (gt and score <= zset[member])):
+                continue
+            zset[member] = score
+
+    async def zscore(self, name, member):
+        return self.zsets.get(name, {}).get(member)
+
+    async def zremrangebyscore(self, name, low, high):
+        zset = self.zsets.get(name, {})
+        for member in [m for m, score in zset.items() if score <= high]:
+            del zset[member]
+
+    async def zrangebyscore(self, name, low, high):
+        return [m for m, score in self.zsets.get(name, {}).items() if score >= low]
+
+    async def scan_iter(self, match, count=None):
+        self.scans.append(match)
+        prefix = match.rstrip("*")
+        for key in list(self.keys):
+            if key.startswith(prefix):
+                yield key
+
+    async def ttl(self, key):
+        return self.keys[key]
+
+    async def exists(self, *keys):
+        return sum(key in self.keys for key in keys)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.keys.pop(key, None)
+
+def test_unrefreshed_filter_reports_every_token():
+    assert TokenBlacklistFilter().might_contain("any.token")
+
+@pytest.mark.asyncio
+async def test_refresh_reads_the_sorted_set_without_scanning():
+    redis = FakeRedis()
+    redis.keys["ratelimit:/ping:10.0.0.1"] = 60
+    await revoke_token(redis, "revoked", 60)
+    blacklist = TokenBlacklistFilter()
+    await blacklist.refresh(redis)
+    assert blacklist.might_contain("revoked")
+    assert not blacklist.might_contain("live")
+    assert redis.scans == []
+
+@pytest.mark.asyncio
+async def test_refresh_drops_expired_entries():
+    redis = FakeRedis()
+    redis.zsets[BLACKLIST_KEY] = {token_digest("old"): time.time() - 1}
+    blacklist = TokenBlacklistFilter()
+    await blacklist.refresh(redis)
+    assert not blacklist.might_contain("old")
+    assert redis.zsets[BLACKLIST_KEY] == {}
+
+@pytest.mark.asyncio
+async def test_is_token_revoked():
+    redis = FakeRedis()
+    await revoke_token(redis, "revoked", 60)
+    assert await is_token_revoked(redis, "revoked")
+    assert not await is_token_revoked(redis, "live")
+
+@pytest.mark.asyncio
+async def test_unmigrated_legacy_keys_still_revoke():
+    redis = FakeRedis()
+    redis.keys["blacklist:raw"] = 60
+    redis.keys[f"bl:{token_digest('hashed')}"] = 60
+    assert await is_token_revoked(redis, "raw")
+    assert await is_token_revoked(redis, "hashed")
+
+@pytest.mark.asyncio
+async def test_legacy_keys_are_migrated_into_the_sorted_set():
+    redis = FakeRedis()
+    redis.keys["blacklist:raw"] = 60
+    redis.keys[f"bl:{token_digest('hashed')}"] = 60
+    assert await migrate_legacy_keys(redis) == 2
+    assert redis.keys == {}
+    blacklist = TokenBlacklistFilter()
+    await blacklist.refresh(redis)
+    assert blacklist.might_contain("raw")
+    assert blacklist.might_contain("hashed")
+
+@pytest.mark.asyncio
+async def test_local_revocation_survives_a_stale_refresh():
+    redis = FakeRedis()
+    blacklist = TokenBlacklistFilter()
+    await blacklist.refresh(redis)
+    # Revoked here after the refresh read Redis but before it finished
+    blacklist.add("revoked")
+    await blacklist.refresh(redis)
+    assert blacklist.might_contain("revoked")
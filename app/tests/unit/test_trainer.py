@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from app.core.training_config import training_config
+from app.training import trainer as trainer_module
+from app.training.trainer import ModelTrainer
+
+class FakeRedis:
+    def __init__(self, keys):
+        self.keys_present = keys
+        self.deleted = []
+
+    def keys(self, pattern):
+        return list(self.keys_present)
+
+    def delete(self, *keys):
+        self.deleted.extend(keys)
+
+@pytest.fixture
+def tiny_training(monkeypatch, tmp_path):
+    monkeypatch.setattr(training_config, "MODEL_CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+    monkeypatch.setattr(training_config, "MODEL_SAVE_PATH", str(tmp_path / "recommender.keras"))
+    monkeypatch.setattr(training_config, "EMBEDDING_DIM", 8)
+    monkeypatch.setattr(training_config, "BATCH_SIZE", 8)
+    monkeypatch.setattr(training_config, "EPOCHS", 1)
+    redis = FakeRedis(["recommendations:u1"])
+    monkeypatch.setattr(trainer_module, "redis_client", redis)
+
+    rng = np.random.default_rng(0)
+    user_ids = np.arange(64) % 8
+    item_ids = rng.integers(0, 6, size=64)
+    labels = rng.choice([0.5, 1.0], size=64)
+
+    async def prepare_training_data(self):
+        return user_ids, item_ids, labels
+
+    monkeypatch.setattr(ModelTrainer, "prepare_training_data", prepare_training_data)
+    return redis
+
+@pytest.mark.asyncio
+async def test_train_model_saves_and_refreshes_serving_snapshot(tiny_training, tmp_path):
+    trainer = ModelTrainer()
+
+    metrics = await trainer.train_model()
+
+    assert set(metrics) == {"train_loss", "train_accuracy", "val_loss", "val_accuracy"}
+    assert (tmp_path / "recommender.keras").exists()
+    assert trainer.current_version == 1
+    assert tiny_training.deleted == ["recommendations:u1"]
+
+    # The int8 snapshot was taken from the trained weights
+    recommender = trainer.recommender
+    trained = recommender.user_embedding.embeddings.numpy()
+    np.testing.assert_allclose(recommender.get_user_embedding(3), trained[3], atol=np.abs(trained[3]).max() / 100)
+    assert len(recommender.get_recommendations(3, item_ids=[0, 1, 2], top_k=2)) == 2
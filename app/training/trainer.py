@@ -1,3 +1,4 @@
+import asyncio
 import tensorflow as tf
 import numpy as np
 from typing import List, Tuple, Dict, Optional
@@ -5,7 +6,7 @@ from datetime import datetime, timedelta
 import os
 import json
 from app.core.training_config import training_config
-from app.models.neural_recommender import NeuralRecommender
+from app.models.neural_recommender import NeuralRecommender, mixed_precision_policy
 from app.db.database import mongodb, redis_client
 import logging
 from sklearn.model_selection import train_test_split
@@ -15,6 +16,9 @@ logger = logging.getLogger(__name__)
 class ModelTrainer:
     def __init__(self):
         self.model = None
+        # The subclassed model behind self.model's functional graph; the two
+        # share layers, so it serves inference from the trained weights
+        self.recommender: Optional[NeuralRecommender] = None
         self.current_version = 0
         self.last_training_time = datetime.utcnow()
         self.new_interactions_count = 0
@@ -64,20 +68,25 @@ class ModelTrainer:
             np.array(labels)
         )
 
-    def _create_model(self, num_users: int, num_items: int) -> NeuralRecommender:
+    def _create_model(self, num_users: int, num_items: int) -> tf.keras.Model:
         """Create a new model instance."""
-        model = NeuralRecommender(
+        self.recommender = NeuralRecommender(
             num_users=num_users,
             num_items=num_items,
             embedding_dim=training_config.EMBEDDING_DIM
         )
         
         # Build model graph
-        model = model.build_graph()
+        model = self.recommender.build_graph()
+        
+        # float16 gradients underflow without loss scaling (bfloat16 doesn't need it)
+        optimizer = tf.keras.optimizers.Adam(training_config.LEARNING_RATE)
+        if mixed_precision_policy() == "mixed_float16":
+            optimizer = tf.keras.mixed_precision.LossScaleOptimizer(optimizer)
         
         # Compile model
         model.compile(
-            optimizer=tf.keras.optimizers.Adam(training_config.LEARNING_RATE),
+            optimizer=optimizer,
             loss=tf.keras.losses.BinaryCrossentropy(),
             metrics=[
                 tf.keras.metrics.BinaryAccuracy(),
@@ -172,8 +181,9 @@ class ModelTrainer:
             self.checkpoint_callback.monitor = "binary_accuracy"
             self.checkpoint_callback.mode = "max"
             
-            # Train model
-            history = await self.model.fit(
+            # Train model; fit blocks, so keep it off the event loop
+            history = await asyncio.to_thread(
+                self.model.fit,
                 train_dataset,
                 epochs=training_config.EPOCHS,
                 steps_per_epoch=steps_per_epoch,
@@ -185,6 +195,10 @@ class ModelTrainer:
                 ]
             )
             
+            # Inference reads the int8 snapshot, so retake it from the new weights
+            if self.recommender is not None:
+                self.recommender.refresh_embedding_cache()
+            
             # Save final model
             self.model.save(training_config.MODEL_SAVE_PATH)
             
@@ -0,0 +1,21 @@
+"""
+Cheap wall-clock timestamps for frequently polled endpoints.
+"""
+
+import time
+from datetime import datetime
+
+# [epoch second, formatted ISO string] for the last second seen
+_last_ts = [0, ""]
+
+def iso_now() -> str:
+    """Return the current local time as a seconds-resolution ISO string.
+
+    The string is formatted at most once per second, so endpoints polled by
+    uptime monitors don't allocate and format a datetime on every hit.
+    """
+    t = int(time.time())
+    if t != _last_ts[0]:
+        _last_ts[1] = datetime.fromtimestamp(t).isoformat()
+        _last_ts[0] = t
+    return _last_ts[1]
@@ -0,0 +1,19 @@
+"""
+Identifier generation for primary keys.
+"""
+
+import os
+import time
+import uuid
+
+def uuid7() -> uuid.UUID:
+    """Time-ordered UUID (RFC 9562 version 7).
+
+    The leading 48 bits are the Unix time in milliseconds, so new keys land
+    at the right edge of a B-tree index instead of at random pages.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    # Overwrite the version (0111) and variant (10) bits
+    value = (value & ~(0xF << 76)) | (0x7 << 76)
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)
+    return uuid.UUID(int=value)